@@ -1,14 +1,22 @@
+import os
+
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as patheffects
-from config import supabase
-from services.user_service import UserService
-from services.title_service import TitleService
+from charts import CHART_RENDERER, bar_spec, status_pie_png, status_pie_spec
+from config import get_supabase
+from dao.instrumentation import metrics
+from http_client import pool_metrics
+from services.page_loader import PageLoader
+from services.user_service import AsyncUserService, UserService
+from services.title_service import AsyncTitleService, TitleService
 from services.watchlist_service import WatchlistService
+from services.watchlist_store import WatchlistStore
 
 user_service = UserService()
 title_service = TitleService()
 watchlist_service = WatchlistService()
+async_user_service = AsyncUserService()
+async_title_service = AsyncTitleService()
+page_loader = PageLoader()
 
 
 st.set_page_config(
@@ -225,7 +233,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 if "user" not in st.session_state:
-    session = supabase.auth.get_session()
+    session = get_supabase().auth.get_session()
     if session and session.user:
         st.session_state.user = {
             "user_id": session.user.id,
@@ -238,12 +246,31 @@ if "user" not in st.session_state:
         st.session_state.show_main_app = False
 
 
+def current_user():
+    # Registration stores the inserted rows, login a single row; either may
+    # be a dict or a dao.models.User.
+    user_data = st.session_state.get("user")
+    if isinstance(user_data, list):
+        return user_data[0] if user_data else {}
+    return user_data or {}
+
+
 def clear_session():
     st.session_state.user = None
+    st.session_state.pop("watchlist_store", None)
     st.session_state.show_main_app = False
     st.rerun()
 
 
+def watchlist_store(user_id):
+    # The page reads the session's copy of the watchlist; mutations patch it
+    # from the rows they return, so the rerun after a write needs no fetch.
+    store = st.session_state.get("watchlist_store")
+    if store is None or store.user_id != user_id:
+        store = st.session_state.watchlist_store = WatchlistStore(watchlist_service, user_id)
+    return store
+
+
 def handle_response(res, success_message="✅ Done!"):
     if isinstance(res, dict) and "error" in res:
         st.error(f"❌ {res['error']}", icon="⚠️")
@@ -271,43 +298,132 @@ def display_stat_card(label, value, icon=""):
     """, unsafe_allow_html=True)
 
 
+PAGE_SIZES = [10, 25, 50, 100]
+AUTOCOMPLETE_LIMIT = 20
+TOP_GENRES = 10
+RECOMMENDATIONS = 6
+
+
+def render_paginated_list(key, fetch_page, render_item, empty_message, filter_placeholder="Filter..."):
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input("Filter", key=f"{key}_filter", placeholder=filter_placeholder, label_visibility="collapsed")
+    with col2:
+        page_size = st.selectbox("Per page", PAGE_SIZES, key=f"{key}_page_size", label_visibility="collapsed")
+
+    page_key = f"{key}_page"
+    view = (query, page_size)
+    if st.session_state.get(f"{key}_view") != view:
+        st.session_state[f"{key}_view"] = view
+        st.session_state[page_key] = 0
+
+    page = st.session_state.get(page_key, 0)
+    rows, total = fetch_page(page * page_size, page_size, query or None)
+    total_pages = max(1, -(-total // page_size))
+    if page >= total_pages:
+        page = st.session_state[page_key] = total_pages - 1
+        rows, total = fetch_page(page * page_size, page_size, query or None)
+
+    if not rows:
+        st.info(empty_message)
+        return rows
+
+    for item in rows:
+        render_item(item)
+
+    def go_to(target):
+        st.session_state[page_key] = target
+
+    nav1, nav2, nav3 = st.columns([1, 2, 1])
+    with nav1:
+        st.button("◀ Prev", key=f"{key}_prev", disabled=page == 0, on_click=go_to, args=(page - 1,), use_container_width=True)
+    with nav2:
+        st.caption(f"Page {page + 1} of {total_pages} · {total} items")
+    with nav3:
+        st.button("Next ▶", key=f"{key}_next", disabled=page >= total_pages - 1, on_click=go_to, args=(page + 1,), use_container_width=True)
+    return rows
+
+
+def render_watchlist_item(item):
+    with st.container(border=True):
+        col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+        with col1:
+            st.markdown(f"**{item.get('title') or 'Unknown title'}**")
+        with col2:
+            status = item.get("status", "").lower()
+            status_class = f"status-{status}"
+            st.markdown(f"<span class='status-badge {status_class}'>{status}</span>", unsafe_allow_html=True)
+        with col3:
+            if item.get("rating"):
+                st.markdown(f"<div class='rating-display'>⭐ {item['rating']}/10</div>", unsafe_allow_html=True)
+        with col4:
+            st.caption(f"ID: {item.get('watchlist_id', '?')}")
+
+
+def render_title_item(item):
+    with st.container(border=True):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            st.markdown(f"**{item.get('title')}**")
+        with col2:
+            st.caption(f"📺 {item.get('type', 'N/A')}")
+        with col3:
+            st.caption(f"ID: {item.get('movie_id', '?')}")
+
+
+def render_stats_panels(stats):
+    if not stats["entries"]:
+        return
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.caption("⭐ Ratings")
+        st.vega_lite_chart(bar_spec(stats["rating_histogram"], "rating"), use_container_width=True)
+    with col2:
+        st.caption("🎭 Top Genres")
+        genres = dict(list(stats["genre_counts"].items())[:TOP_GENRES])
+        st.vega_lite_chart(bar_spec(genres, "genre"), use_container_width=True)
+    with col3:
+        st.caption("✅ Completion by Type")
+        rates = {type_.title(): row["rate"] for type_, row in stats["completion_by_type"].items()}
+        st.vega_lite_chart(bar_spec(rates, "type", "rate", percent=True), use_container_width=True)
+    if stats["average_rating"] is not None:
+        st.caption(f"Average rating {stats['average_rating']:.1f}/10 across {stats['entries']} entries")
+
+
 def display_dashboard(show_user_data=True,outer=True):
-    users = user_service.list_users()
-    total_users = len(users) if users else 0
-    
-    titles = title_service.list_all_titles()
-    total_titles = len(titles) if titles else 0
-    
+    user = current_user()
+
+    user_id = user.get("user_id") if show_user_data else None
+
+    queries = {}
+    if(outer==True):
+        queries["total_users"] = async_user_service.count_users()
+        queries["total_titles"] = async_title_service.count_titles()
+    data, errors = page_loader.load(queries)
+    if errors:
+        st.warning(f"⚠️ Some statistics could not be loaded: {', '.join(errors)}")
+
     col1, col2 = st.columns(2)
     if(outer==True):
         with col1:
-            display_stat_card("Total Users", total_users, "👥")
+            display_stat_card("Total Users", data.get("total_users", "—"), "👥")
         with col2:
-            display_stat_card("Total Titles", total_titles, "🎥")
+            display_stat_card("Total Titles", data.get("total_titles", "—"), "🎥")
+        st.markdown("<h3 class='section-title'>🌐 Across All Watchlists</h3>", unsafe_allow_html=True)
+        platform_stats = watchlist_service.get_platform_stats()
+        if platform_stats:
+            render_stats_panels(platform_stats)
+        else:
+            st.caption("⏳ Platform statistics are being computed; they will appear on a later visit.")
     
     if show_user_data and st.session_state.user:
-        
-        user_data = st.session_state.get("user")
-
-        if isinstance(user_data, list) and len(user_data) > 0:
-            user = user_data[0]
-        elif isinstance(user_data, dict):
-            user = user_data
-        else:
-            user = {}
-
-        user_id = user.get("user_id")
-
-        if user_id:
-            watchlist = watchlist_service.get_user_watchlist(user_id)
-        else:
-            watchlist = []
+        stats = watchlist_service.get_user_stats(user_id)
+        counts = stats["status_counts"]
 
-        total_watchlist = len(watchlist) if watchlist else 0
-        
-        watched = len([w for w in watchlist if w.get("status") == "watched"])
-        planning = len([w for w in watchlist if w.get("status") == "planning"])
-        dropped = len([w for w in watchlist if w.get("status") == "dropped"])
+        watched = counts.get("watched", 0)
+        planning = counts.get("planning", 0)
+        dropped = counts.get("dropped", 0)
+        total_watchlist = watched + planning + dropped
         
         st.markdown("<h3 class='section-title'>📊 Your Watchlist Breakdown</h3>", unsafe_allow_html=True)
         
@@ -327,64 +443,10 @@ def display_dashboard(show_user_data=True,outer=True):
             
             with col1:
                 
-                fig, ax = plt.subplots(figsize=(7, 6), facecolor='none')
-                ax.set_facecolor('none')
-
-                labels = ["Watched", "Planning", "Dropped"]
-                sizes = [watched, planning, dropped]
-
-                glow_colors = ["#5168FF", "#6B8AFF", "#9550FF"]
-                transparent_colors = ["#4159D029", "#5A7FDB5A", "#7C3AED39"]  # 75% transparent
-
-                for width, alpha in zip([4], [0.06]):
-                    start_angle = 90
-                    total = sum(sizes)
-                    for size, glow_color in zip(sizes, glow_colors):
-                        theta1 = start_angle
-                        theta2 = start_angle + (size / total) * 360
-                        
-                        ax.pie(
-                            [1],
-                            radius=1,
-                            startangle=theta1,
-                            colors=["none"],
-                            wedgeprops={
-                                'edgecolor': glow_color,
-                                'linewidth': width,
-                                'alpha': alpha
-                            }
-                        )
-                        start_angle = theta2
-
-                wedges, texts, autotexts = ax.pie(
-                    sizes,
-                    labels=labels,
-                    autopct="%1.1f%%",
-                    startangle=90,
-                    colors=transparent_colors,
-                    wedgeprops={
-                        'linewidth': 4,
-                        'edgecolor': glow_colors[0],
-                        'alpha': 0.75
-                    }
-                )
-                for i, wedge in enumerate(wedges):
-                    wedge.set_edgecolor(glow_colors[i])
-                for t in texts:
-                    t.set_color('#ffffff')
-                    t.set_fontsize(13)
-                    t.set_fontweight('bold')
-                    t.set_path_effects([patheffects.withStroke(linewidth=3, foreground='#000000')])
-
-                for autotext in autotexts:
-                    autotext.set_color('#ffffff')
-                    autotext.set_fontsize(12)
-                    autotext.set_fontweight('bold')
-                    autotext.set_path_effects([patheffects.withStroke(linewidth=2, foreground='#000000')])
-
-                ax.axis("equal")
-
-                st.pyplot(fig, transparent=True, use_container_width=True)
+                if CHART_RENDERER == "native":
+                    st.vega_lite_chart(status_pie_spec(watched, planning, dropped), use_container_width=True)
+                else:
+                    st.image(status_pie_png(watched, planning, dropped), use_container_width=True)
             
             with col2:
                 st.markdown("""
@@ -399,6 +461,9 @@ def display_dashboard(show_user_data=True,outer=True):
                     </div>
                 """, unsafe_allow_html=True)
 
+            st.markdown("<h3 class='section-title'>🔎 Your Tastes</h3>", unsafe_allow_html=True)
+            render_stats_panels(stats)
+
 def login_page():
     render_page_header("🎬 Watchlist Manager", "Organize your entertainment, track your progress, manage your time")
     
@@ -460,14 +525,7 @@ def login_page():
 
 def main_app():
     with st.sidebar:
-        user_data = st.session_state.get("user")
-
-        if isinstance(user_data, list) and len(user_data) > 0:
-            user = user_data[0]
-        elif isinstance(user_data, dict):
-            user = user_data
-        else:
-            user = {}
+        user = current_user()
 
         profile_pic = user.get("profile_pic")
         if profile_pic:
@@ -506,43 +564,34 @@ def main_app():
     elif menu == "📋 My Watchlist":
         render_page_header("📋 My Watchlist", "Manage your collection of watched and planned titles")
         
-        user_data = st.session_state.get("user")
-
-        if isinstance(user_data, list) and len(user_data) > 0:
-            user = user_data[0]
-        elif isinstance(user_data, dict):
-            user = user_data
-        else:
-            user = {}
+        user = current_user()
 
         user_id = user.get("user_id")
+        store = watchlist_store(user_id)
 
+        st.markdown("<h3 class='section-title'>Your Entries</h3>", unsafe_allow_html=True)
         if user_id:
-            watchlist = watchlist_service.get_user_watchlist(user_id)
+            watchlist = render_paginated_list(
+                "watchlist",
+                store.page,
+                render_watchlist_item,
+                "📭 Your watchlist is empty. Add something to get started!",
+                "Filter your entries by title...",
+            )
         else:
             watchlist = []
-
-        
-        if watchlist:
-            st.markdown("<h3 class='section-title'>Your Entries</h3>", unsafe_allow_html=True)
-            for item in watchlist:
-                with st.container(border=True):
-                    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
-                    with col1:
-                        title=title_service.get_title(movie_id=item.get('movie_id'))
-                        x=title[0]
-                        st.markdown(f"**{x['title']}**")
-                    with col2:
-                        status = item.get("status", "").lower()
-                        status_class = f"status-{status}"
-                        st.markdown(f"<span class='status-badge {status_class}'>{status}</span>", unsafe_allow_html=True)
-                    with col3:
-                        if item.get("rating"):
-                            st.markdown(f"<div class='rating-display'>⭐ {item['rating']}/10</div>", unsafe_allow_html=True)
-                    with col4:
-                        st.caption(f"ID: {item.get('watchlist_id', '?')}")
-        else:
             st.info("📭 Your watchlist is empty. Add something to get started!")
+
+        if user_id:
+            st.markdown("<h3 class='section-title'>✨ Users Who Watched These Also Watched</h3>", unsafe_allow_html=True)
+            recommendations = watchlist_service.recommend(user_id, RECOMMENDATIONS)
+            if not recommendations:
+                st.caption("⏳ Recommendations are being computed; check back shortly.")
+            columns = st.columns(3)
+            for i, item in enumerate(recommendations):
+                with columns[i % 3], st.container(border=True):
+                    st.markdown(f"**{item['title']}**")
+                    st.caption(f"📺 {item.get('type') or 'N/A'} | {item.get('genre') or 'N/A'} | ID: {item['movie_id']}")
         
         st.divider()
         
@@ -550,64 +599,68 @@ def main_app():
         
         with tabs[0]:
             st.markdown("<h3 class='section-title'>Add to Watchlist</h3>", unsafe_allow_html=True)
-            with st.form("add_watchlist"):
-                titles = title_service.list_all_titles()
-                title_options = {f"{t.get('title')} (ID: {t.get('movie_id', '?')})": t["movie_id"]
-                                 for t in titles if "movie_id" in t}
-                
-                if title_options:
-                    movie_id = st.selectbox("Select a Title", list(title_options.keys()))
+            prefix = st.text_input("🔍 Find a Title", key="add_watchlist_query", placeholder="Start typing a title...")
+            matches = title_service.autocomplete(prefix, AUTOCOMPLETE_LIMIT) if prefix else []
+            title_options = {f"{t.get('title')} (ID: {t.get('movie_id', '?')})": t["movie_id"]
+                             for t in matches if "movie_id" in t}
+            title_rows = {t["movie_id"]: t for t in matches if "movie_id" in t}
+
+            if title_options:
+                with st.form("add_watchlist"):
+                    selected = st.multiselect("Select Titles", list(title_options.keys()))
                     status = st.selectbox("Status", ["Watched", "Planning", "Dropped"])
                     rating = st.slider("Rating", 1, 10, 5)
                     review = st.text_area("Review (optional)", placeholder="Share your thoughts...")
                     
                     if st.form_submit_button("➕ Add to Watchlist", use_container_width=True):
-                        res = watchlist_service.add_to_watchlist(
-                            st.session_state.user["user_id"], title_options[movie_id], status, rating, review or None
+                        res = store.add_many(
+                            [title_options[s] for s in selected], status, rating, review or None, title_rows
                         )
-                        handle_response(res, "✅ Added to watchlist!")
-                else:
-                    st.warning("⚠️ No titles available. Please add titles first.")
+                        handle_response(res, f"✅ Added {len(selected)} to watchlist!")
+            elif prefix:
+                st.warning("⚠️ No titles match. Try another name or add the title first.")
+            else:
+                st.info("🔍 Type the start of a title to pick it.")
         
         with tabs[1]:
             st.markdown("<h3 class='section-title'>Update Entry</h3>", unsafe_allow_html=True)
             if watchlist:
-                title=title_service.get_title(movie_id=item.get('movie_id'))
-                x=title[0]
+                st.caption("Showing entries from the current page.")
                 options = {
-                    f"{w.get(x['title'])} (ID: {w.get('movie_id', '?')})": w["watchlist_id"]
+                    f"{w.get('title')} (ID: {w.get('movie_id', '?')})": w["watchlist_id"]
                     for w in watchlist if "watchlist_id" in w
                 }
                 with st.form("update_watchlist"):
-                    watchlist_id = st.selectbox("Select Entry to Update", options.keys())
+                    selected = st.multiselect("Select Entries to Update", options.keys())
                     new_status = st.selectbox("New Status", ["", "Watched", "Planning", "Dropped"])
                     new_rating = st.slider("New Rating", 0, 10, 0)
                     new_review = st.text_area("New Review (optional)")
                     
-                    if st.form_submit_button("✏️ Update Entry", use_container_width=True):
-                        res = watchlist_service.update_watchlist_entry(
-                            options[watchlist_id],
+                    if st.form_submit_button("✏️ Update Entries", use_container_width=True):
+                        res = store.update_many(
+                            [options[s] for s in selected],
                             new_status if new_status else None,
                             new_rating if new_rating > 0 else None,
                             new_review or None,
                         )
-                        handle_response(res, "✅ Updated successfully!")
+                        handle_response(res, f"✅ Updated {len(selected)} entries!")
             else:
                 st.info("📭 Your watchlist is empty.")
         
         with tabs[2]:
             st.markdown("<h3 class='section-title'>Remove Entry</h3>", unsafe_allow_html=True)
             if watchlist:
+                st.caption("Showing entries from the current page.")
                 options = {
                     f"{w.get('title')} (ID: {w.get('watchlist_id', '?')})": w["watchlist_id"]
                     for w in watchlist if "watchlist_id" in w
                 }
                 with st.form("remove_watchlist"):
-                    watchlist_id = st.selectbox("Select Entry to Remove", options.keys())
+                    selected = st.multiselect("Select Entries to Remove", options.keys())
                     
-                    if st.form_submit_button("❌ Remove Entry", use_container_width=True, type="secondary"):
-                        res = watchlist_service.remove_from_watchlist(options[watchlist_id])
-                        handle_response(res, "✅ Removed from watchlist!")
+                    if st.form_submit_button("❌ Remove Entries", use_container_width=True, type="secondary"):
+                        res = store.remove_many([options[s] for s in selected])
+                        handle_response(res, f"✅ Removed {len(selected)} from watchlist!")
             else:
                 st.info("📭 Your watchlist is empty.")
     
@@ -639,21 +692,14 @@ def main_app():
         
         st.divider()
         
-        titles = title_service.list_all_titles()
         st.markdown("<h3 class='section-title'>📚 All Titles</h3>", unsafe_allow_html=True)
-        
-        if titles:
-            for item in titles:
-                with st.container(border=True):
-                    col1, col2, col3 = st.columns([2, 1, 1])
-                    with col1:
-                        st.markdown(f"**{item.get('title')}**")
-                    with col2:
-                        st.caption(f"📺 {item.get('type', 'N/A')}")
-                    with col3:
-                        st.caption(f"ID: {item.get('movie_id', '?')}")
-        else:
-            st.info("📭 No titles available yet.")
+        titles = render_paginated_list(
+            "titles",
+            lambda offset, limit, keyword: title_service.list_titles_range(offset, limit, keyword, "list"),
+            render_title_item,
+            "📭 No titles available yet.",
+            "Filter titles by name...",
+        )
         
         st.divider()
         
@@ -676,6 +722,7 @@ def main_app():
         with tabs[1]:
             st.markdown("<h3 class='section-title'>Update Title</h3>", unsafe_allow_html=True)
             if titles:
+                st.caption("Showing titles from the current page.")
                 options = {f"{t.get('title')} (ID: {t.get('movie_id', '?')})": t["movie_id"]
                            for t in titles if "movie_id" in t}
                 with st.form("update_title"):
@@ -698,6 +745,7 @@ def main_app():
         with tabs[2]:
             st.markdown("<h3 class='section-title'>Delete Title</h3>", unsafe_allow_html=True)
             if titles:
+                st.caption("Showing titles from the current page.")
                 options = {f"{t.get('title')} (ID: {t.get('movie_id', '?')})": t["movie_id"]
                            for t in titles if "movie_id" in t}
                 with st.form("delete_title"):
@@ -711,7 +759,45 @@ def main_app():
             else:
                 st.info("📭 No titles to delete.")
 
-if st.session_state.user and st.session_state.show_main_app:
-    main_app()
-else:
-    login_page()
\ No newline at end of file
+# Comma-separated emails of the users allowed to open the ?debug=1 panel;
+# the metrics it shows are process-wide, so it is off unless this is set.
+DEBUG_ADMINS = {email.strip().lower() for email in os.getenv("DEBUG_ADMINS", "").split(",") if email.strip()}
+
+
+def can_debug():
+    if not (st.session_state.user and st.session_state.show_main_app):
+        return False
+    return (current_user().get("email") or "").lower() in DEBUG_ADMINS
+
+
+def render_debug_panel(request_id):
+    with st.sidebar.expander("🌐 HTTP Pool"):
+        pools = pool_metrics()
+        if pools:
+            st.dataframe(pools, hide_index=True, use_container_width=True)
+        else:
+            st.caption("No pooled HTTP clients yet.")
+    with st.sidebar.expander("🛠️ DAO Metrics"):
+        if not metrics.enabled:
+            st.caption("Instrumentation is off. Set DAO_METRICS=1 to turn it on.")
+            return
+        rerun = metrics.request_snapshot(request_id)
+        st.caption(f"This rerun: {sum(m['calls'] for m in rerun.values())} calls, "
+                   f"{sum(m['seconds'] for m in rerun.values()) * 1000:.0f} ms")
+        st.dataframe(
+            [{"method": name, **stats} for name, stats in sorted(rerun.items())],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.download_button("Prometheus", metrics.to_prometheus(), "dao_metrics.prom", use_container_width=True)
+        st.download_button("JSON", metrics.to_json(), "dao_metrics.json", use_container_width=True)
+
+
+with metrics.request_scope() as request_id:
+    if st.session_state.user and st.session_state.show_main_app:
+        main_app()
+    else:
+        login_page()
+
+if st.query_params.get("debug") == "1" and can_debug():
+    render_debug_panel(request_id)
\ No newline at end of file
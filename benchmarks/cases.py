@@ -0,0 +1,427 @@
+import itertools
+
+from services.page_loader import PageLoader
+from services.watchlist_store import WatchlistStore
+
+# Every case returns (calls, cleanup): the calls are timed one by one, and
+# setup work and cleanup stay outside the measurement. Cases marked heavy
+# scan whole tables and are capped to a few iterations.
+
+CASES = {}
+HEAVY = set()
+
+
+def case(name: str, heavy: bool = False):
+    def register(fn):
+        CASES[name] = fn
+        if heavy:
+            HEAVY.add(name)
+        return fn
+    return register
+
+
+def _repeat(n, fn):
+    return [fn for _ in range(n)], None
+
+
+def _each(ctx, n, pool, fn):
+    picks = [ctx.rng.choice(pool) for _ in range(n)]
+    return [(lambda value=value: fn(value)) for value in picks], None
+
+
+def _scratch_titles(ctx, n):
+    rows = ctx.title_service.add_titles([
+        {"title": f"Bench Title {ctx.rng.random()}", "type": "movie", "genre": "Drama"} for _ in range(n)
+    ])
+    return [row["movie_id"] for row in rows]
+
+
+def _scratch_entries(ctx, n):
+    users = ctx.rng.sample(ctx.user_ids, min(n, len(ctx.user_ids)))
+    movies = _scratch_titles(ctx, n)
+    rows = ctx.watchlist_service.dao.add_many([
+        {"user_id": user_id, "movie_id": movie_id, "status": "planning"}
+        for user_id, movie_id in zip(itertools.cycle(users), movies)
+    ])
+    return [row["watchlist_id"] for row in rows], movies
+
+
+# UserService
+
+@case("UserService.create_user")
+def _(ctx, n):
+    emails = [f"bench-create-{ctx.rng.random()}@example.com" for _ in range(n)]
+    return [(lambda e=e: ctx.user_service.create_user("Bench", e)) for e in emails], \
+        lambda: [ctx.user_service.delete_user(u["user_id"]) for e in emails for u in ctx.user_service.dao.get_user_by_email(e)]
+
+
+@case("UserService.register_user")
+def _(ctx, n):
+    emails = [f"bench-register-{ctx.rng.random()}@example.com" for _ in range(n)]
+    return [(lambda e=e: ctx.user_service.register_user("Bench", e, "password")) for e in emails], \
+        lambda: [ctx.user_service.delete_user(u["user_id"]) for e in emails for u in ctx.user_service.dao.get_user_by_email(e)]
+
+
+@case("UserService.authenticate_user")
+def _(ctx, n):
+    return _each(ctx, n, ctx.emails, lambda email: ctx.user_service.authenticate_user(email, "password"))
+
+
+@case("UserService.get_user")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, ctx.user_service.get_user)
+
+
+@case("UserService.list_users", heavy=True)
+def _(ctx, n):
+    return _repeat(n, ctx.user_service.list_users)
+
+
+@case("UserService.list_users_page")
+def _(ctx, n):
+    return _repeat(n, lambda: ctx.user_service.list_users_page(limit=100))
+
+
+@case("UserService.iter_users", heavy=True)
+def _(ctx, n):
+    return _repeat(n, lambda: sum(1 for _ in ctx.user_service.iter_users()))
+
+
+@case("UserService.count_users")
+def _(ctx, n):
+    return _repeat(n, ctx.user_service.count_users)
+
+
+@case("UserService.update_user")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, lambda user_id: ctx.user_service.update_user(user_id, name="Bench User"))
+
+
+@case("UserService.delete_user")
+def _(ctx, n):
+    users = [ctx.user_service.register_user("Bench", f"bench-delete-{ctx.rng.random()}@example.com", "pw")[0] for _ in range(n)]
+    return [(lambda u=u: ctx.user_service.delete_user(u["user_id"])) for u in users], None
+
+
+@case("UserService.hash_password")
+def _(ctx, n):
+    return _repeat(n, lambda: ctx.user_service.hash_password("password"))
+
+
+# TitleService
+
+@case("TitleService.add_title")
+def _(ctx, n):
+    created = []
+    calls = [(lambda: created.extend(ctx.title_service.add_title(f"Bench {ctx.rng.random()}", "Movie", "Drama"))) for _ in range(n)]
+    return calls, lambda: [ctx.title_service.delete_title(row["movie_id"]) for row in created]
+
+
+@case("TitleService.add_titles")
+def _(ctx, n):
+    created = []
+    batch = lambda: [{"title": f"Bench {ctx.rng.random()}", "type": "movie", "genre": "Drama"} for _ in range(100)]
+    calls = [(lambda: created.extend(ctx.title_service.add_titles(batch()))) for _ in range(n)]
+    return calls, lambda: [ctx.title_service.delete_title(row["movie_id"]) for row in created]
+
+
+@case("TitleService.list_all_titles", heavy=True)
+def _(ctx, n):
+    return _repeat(n, ctx.title_service.list_all_titles)
+
+
+@case("TitleService.list_titles_page")
+def _(ctx, n):
+    return _each(ctx, n, ctx.movie_ids, lambda after: ctx.title_service.list_titles_page(after, 100))
+
+
+@case("TitleService.list_titles_range")
+def _(ctx, n):
+    return _each(ctx, n, range(0, len(ctx.movie_ids), 25), lambda offset: ctx.title_service.list_titles_range(offset, 25))
+
+
+@case("TitleService.iter_titles", heavy=True)
+def _(ctx, n):
+    return _repeat(n, lambda: sum(1 for _ in ctx.title_service.iter_titles()))
+
+
+@case("TitleService.count_titles")
+def _(ctx, n):
+    return _repeat(n, ctx.title_service.count_titles)
+
+
+@case("TitleService.search_titles")
+def _(ctx, n):
+    return _each(ctx, n, ctx.queries, ctx.title_service.search_titles)
+
+
+@case("TitleService.delete_title")
+def _(ctx, n):
+    movie_ids = _scratch_titles(ctx, n)
+    return [(lambda m=m: ctx.title_service.delete_title(m)) for m in movie_ids], None
+
+
+@case("TitleService.list_genres")
+def _(ctx, n):
+    return _repeat(n, ctx.title_service.list_genres)
+
+
+@case("TitleService.genre_counts")
+def _(ctx, n):
+    return _repeat(n, ctx.title_service.genre_counts)
+
+
+@case("TitleService.search_movies")
+def _(ctx, n):
+    ctx.title_service.search_movies("warmup")
+    return _each(ctx, n, ctx.queries, ctx.title_service.search_movies)
+
+
+@case("TitleService.rebuild_search_index", heavy=True)
+def _(ctx, n):
+    return _repeat(n, ctx.title_service.rebuild_search_index)
+
+
+@case("TitleService.autocomplete")
+def _(ctx, n):
+    ctx.title_service.autocomplete("warmup")
+    return _each(ctx, n, ctx.prefixes, ctx.title_service.autocomplete)
+
+
+@case("TitleService.rebuild_autocomplete_index", heavy=True)
+def _(ctx, n):
+    return _repeat(n, ctx.title_service.rebuild_autocomplete_index)
+
+
+@case("TitleService.update_title")
+def _(ctx, n):
+    return _each(ctx, n, ctx.movie_ids, lambda movie_id: ctx.title_service.update_title(movie_id, genre="Drama"))
+
+
+@case("TitleService.get_title")
+def _(ctx, n):
+    return _each(ctx, n, ctx.movie_ids, ctx.title_service.get_title)
+
+
+@case("TitleService.get_titles")
+def _(ctx, n):
+    return [(lambda ids=ctx.rng.sample(ctx.movie_ids, 50): ctx.title_service.get_titles(ids)) for _ in range(n)], None
+
+
+@case("TitleService.cache_stats")
+def _(ctx, n):
+    return _repeat(n, ctx.title_service.cache_stats)
+
+
+# WatchlistService
+
+@case("WatchlistService.add_to_watchlist")
+def _(ctx, n):
+    movies = _scratch_titles(ctx, n)
+    users = [ctx.rng.choice(ctx.user_ids) for _ in movies]
+    calls = [(lambda u=u, m=m: ctx.watchlist_service.add_to_watchlist(u, m, "planning")) for u, m in zip(users, movies)]
+    return calls, lambda: [ctx.title_service.delete_title(m) for m in movies]
+
+
+@case("WatchlistService.add_many")
+def _(ctx, n):
+    movies = _scratch_titles(ctx, n * 20)
+    chunks = [movies[i:i + 20] for i in range(0, len(movies), 20)]
+    calls = [(lambda c=c: ctx.watchlist_service.add_many(ctx.rng.choice(ctx.user_ids), c)) for c in chunks]
+    return calls, lambda: [ctx.title_service.delete_title(m) for m in movies]
+
+
+@case("WatchlistService.get_user_watchlist")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, ctx.watchlist_service.get_user_watchlist)
+
+
+@case("WatchlistService.get_user_watchlist_page")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, lambda u: ctx.watchlist_service.get_user_watchlist_page(u, limit=100))
+
+
+@case("WatchlistService.iter_user_watchlist")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, lambda u: sum(1 for _ in ctx.watchlist_service.iter_user_watchlist(u)))
+
+
+@case("WatchlistService.get_user_watchlist_with_titles")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, ctx.watchlist_service.get_user_watchlist_with_titles)
+
+
+@case("WatchlistService.get_user_watchlist_with_titles_range")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, lambda u: ctx.watchlist_service.get_user_watchlist_with_titles_range(u, 0, 25))
+
+
+@case("WatchlistService.get_user_watchlist_by_status")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, lambda u: ctx.watchlist_service.get_user_watchlist_by_status(u, "watched"))
+
+
+@case("WatchlistService.get_status_counts")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, ctx.watchlist_service.get_status_counts)
+
+
+@case("WatchlistService.get_user_watchlist_by_genre")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, lambda u: ctx.watchlist_service.get_user_watchlist_by_genre(u, "Drama"))
+
+
+@case("WatchlistService.get_user_watchlist_by_genre[index]")
+def _(ctx, n):
+    ctx.watchlist_service.slice_by_genre([], "Drama")
+    return _each(ctx, n, ctx.user_ids, lambda u: ctx.watchlist_service.get_user_watchlist_by_genre(u, "Drama", use_index=True))
+
+
+@case("WatchlistService.slice_by_genre")
+def _(ctx, n):
+    rows = [ctx.watchlist_service.get_user_watchlist_with_titles(u) for u in ctx.rng.sample(ctx.user_ids, min(n, len(ctx.user_ids)))]
+    return [(lambda r=r: ctx.watchlist_service.slice_by_genre(r, "Action, Drama")) for r in itertools.islice(itertools.cycle(rows), n)], None
+
+
+@case("WatchlistService.update_watchlist_entry")
+def _(ctx, n):
+    return _each(ctx, n, ctx.watchlist_ids, lambda w: ctx.watchlist_service.update_watchlist_entry(w, rating=7))
+
+
+@case("WatchlistService.update_many")
+def _(ctx, n):
+    return [(lambda ids=ctx.rng.sample(ctx.watchlist_ids, 20): ctx.watchlist_service.update_many(ids, rating=7)) for _ in range(n)], None
+
+
+@case("WatchlistService.upsert_many")
+def _(ctx, n):
+    batches = [ctx.watchlist_service.dao.get_user_watchlist_page(ctx.rng.choice(ctx.user_ids), limit=20)[0] for _ in range(n)]
+    return [(lambda rows=rows: ctx.watchlist_service.upsert_many(rows)) for rows in batches], None
+
+
+@case("WatchlistService.remove_from_watchlist")
+def _(ctx, n):
+    entries, movies = _scratch_entries(ctx, n)
+    calls = [(lambda w=w: ctx.watchlist_service.remove_from_watchlist(w)) for w in entries]
+    return calls, lambda: [ctx.title_service.delete_title(m) for m in movies]
+
+
+@case("WatchlistService.remove_many")
+def _(ctx, n):
+    entries, movies = _scratch_entries(ctx, n * 20)
+    chunks = [entries[i:i + 20] for i in range(0, len(entries), 20)]
+    calls = [(lambda c=c: ctx.watchlist_service.remove_many(c)) for c in chunks]
+    return calls, lambda: [ctx.title_service.delete_title(m) for m in movies]
+
+
+@case("WatchlistService.get_platform_stats")
+def _(ctx, n):
+    ctx.watchlist_service.rebuild_analytics()
+    return _repeat(n, ctx.watchlist_service.get_platform_stats)
+
+
+@case("WatchlistService.get_user_stats")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, ctx.watchlist_service.get_user_stats)
+
+
+@case("WatchlistService.rebuild_user_stats")
+def _(ctx, n):
+    return _each(ctx, n, ctx.user_ids, ctx.watchlist_service.rebuild_user_stats)
+
+
+@case("WatchlistService.verify_user_stats")
+def _(ctx, n):
+    users = [ctx.rng.choice(ctx.user_ids) for _ in range(n)]
+    for user_id in users:
+        ctx.watchlist_service.get_user_stats(user_id)
+    return [(lambda u=u: ctx.watchlist_service.verify_user_stats(u)) for u in users], None
+
+
+@case("WatchlistService.recommend")
+def _(ctx, n):
+    ctx.watchlist_service.rebuild_recommendations()
+    return _each(ctx, n, ctx.user_ids, ctx.watchlist_service.recommend)
+
+
+@case("WatchlistService.rebuild_recommendations", heavy=True)
+def _(ctx, n):
+    return _repeat(n, ctx.watchlist_service.rebuild_recommendations)
+
+
+@case("WatchlistService.rebuild_analytics", heavy=True)
+def _(ctx, n):
+    return _repeat(n, ctx.watchlist_service.rebuild_analytics)
+
+
+@case("WatchlistService.refresh_analytics")
+def _(ctx, n):
+    # An incremental pull: each call finds the snapshot past its refresh age.
+    ctx.watchlist_service.rebuild_analytics()
+
+    def refresh():
+        ctx.watchlist_service.analytics.expire()
+        ctx.watchlist_service.refresh_analytics()
+    return _repeat(n, refresh)
+
+
+# Page data paths
+
+@case("page.dashboard")
+def _(ctx, n):
+    def load(user_id):
+        ctx.user_service.count_users()
+        ctx.title_service.count_titles()
+        ctx.watchlist_service.get_user_stats(user_id)
+    return _each(ctx, n, ctx.user_ids, load)
+
+
+@case("page.dashboard_concurrent")
+def _(ctx, n):
+    loader = PageLoader()
+
+    def load(user_id):
+        data = loader.load({
+            "total_users": ctx.async_user_service.count_users(),
+            "total_titles": ctx.async_title_service.count_titles(),
+        })
+        ctx.watchlist_service.get_user_stats(user_id)
+        return data
+    return _each(ctx, n, ctx.user_ids, load)
+
+
+@case("page.watchlist")
+def _(ctx, n):
+    ctx.watchlist_service.rebuild_recommendations()
+
+    def load(user_id):
+        ctx.watchlist_service.get_user_watchlist_with_titles_range(user_id, 0, 25)
+        ctx.watchlist_service.recommend(user_id, 6)
+        ctx.title_service.autocomplete(ctx.rng.choice(ctx.prefixes), 20)
+    return _each(ctx, n, ctx.user_ids, load)
+
+
+# A status change from the watchlist page followed by the rerun that
+# redraws it: refetching the page versus patching the session store.
+
+@case("page.watchlist_after_update")
+def _(ctx, n):
+    def update(user_id):
+        rows, _ = ctx.watchlist_service.get_user_watchlist_with_titles_range(user_id, 0, 25, None, "page")
+        ctx.watchlist_service.update_many([row["watchlist_id"] for row in rows[:3]], "watched")
+        ctx.watchlist_service.get_user_watchlist_with_titles_range(user_id, 0, 25, None, "page")
+    return _each(ctx, n, ctx.user_ids, update)
+
+
+@case("page.watchlist_after_update[store]")
+def _(ctx, n):
+    # Sessions load their store once, on the first visit to the page.
+    stores = [WatchlistStore(ctx.watchlist_service, ctx.rng.choice(ctx.user_ids)) for _ in range(n)]
+    for store in stores:
+        store.rows()
+
+    def update(store):
+        rows, _ = store.page(0, 25)
+        store.update_many([row["watchlist_id"] for row in rows[:3]], "watched")
+        store.page(0, 25)
+    return [(lambda store=store: update(store)) for store in stores], None
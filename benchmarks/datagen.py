@@ -0,0 +1,121 @@
+import argparse
+import hashlib
+import math
+import random
+import time
+from itertools import accumulate
+
+from dao.sqlite_backend import SQLiteClient
+
+PRESETS = {
+    "tiny": {"users": 200, "titles": 2_000, "watchlist": 20_000},
+    "small": {"users": 1_000, "titles": 10_000, "watchlist": 100_000},
+    "medium": {"users": 10_000, "titles": 100_000, "watchlist": 1_000_000},
+    "large": {"users": 10_000, "titles": 100_000, "watchlist": 5_000_000},
+}
+
+GENRES = [
+    "Drama", "Comedy", "Action", "Thriller", "Romance", "Horror", "Sci-Fi", "Fantasy",
+    "Crime", "Adventure", "Animation", "Mystery", "Documentary", "Family", "Slice of Life",
+    "Mecha", "Musical", "War", "Western", "Sports",
+]
+TYPES = (("movie", 0.6), ("show", 0.3), ("anime", 0.1))
+STATUSES = (("watched", 0.5), ("planning", 0.35), ("dropped", 0.15))
+SYLLABLES = ["ka", "ri", "to", "ne", "mo", "sa", "lu", "vi", "dra", "gon", "star", "night", "fall", "sun", "ro", "shi"]
+WORDS = ["The", "Last", "Dark", "Lost", "City", "Dream", "War", "Love", "Blue", "Iron", "Secret", "Ghost", "Road", "King"]
+PASSWORD_HASH = hashlib.sha256(b"password").hexdigest()
+BATCH = 50_000
+
+
+def zipf_cum_weights(n: int, s: float = 1.1):
+    return list(accumulate(1 / (rank ** s) for rank in range(1, n + 1)))
+
+
+def weighted(rng: random.Random, choices):
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def random_title(rng: random.Random, index: int):
+    made_up = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+    words = rng.sample(WORDS, rng.randint(0, 2))
+    return " ".join(words + [made_up]) + (f" {rng.randint(2, 4)}" if index % 17 == 0 else "")
+
+
+def generate(client: SQLiteClient, users: int, titles: int, watchlist: int, seed: int = 42, log=print):
+    rng = random.Random(seed)
+    connection = client.connection
+    started = time.perf_counter()
+
+    user_ids = [f"{rng.getrandbits(128):032x}" for _ in range(users)]
+    with connection:
+        connection.executemany(
+            "INSERT INTO users (user_id, name, email, password) VALUES (?, ?, ?, ?)",
+            ((user_id, f"User {i}", f"user{i}@example.com", PASSWORD_HASH) for i, user_id in enumerate(user_ids)),
+        )
+    log(f"  users: {users} ({time.perf_counter() - started:.1f}s)")
+
+    genre_weights = zipf_cum_weights(len(GENRES))
+    with connection:
+        connection.executemany(
+            "INSERT INTO movies_shows (movie_id, title, type, genre) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    movie_id,
+                    random_title(rng, movie_id),
+                    weighted(rng, TYPES),
+                    ", ".join(dict.fromkeys(rng.choices(GENRES, cum_weights=genre_weights, k=rng.randint(1, 3)))),
+                )
+                for movie_id in range(1, titles + 1)
+            ),
+        )
+    log(f"  titles: {titles} ({time.perf_counter() - started:.1f}s)")
+
+    # Watchlist sizes are lognormal and title popularity is Zipf-like, so a
+    # few users and a few titles account for most rows.
+    title_weights = zipf_cum_weights(titles, s=0.8)
+    mean = max(1.0, watchlist / max(users, 1))
+    mu = math.log(mean) - 0.5
+    movie_ids = range(1, titles + 1)
+    written = 0
+    batch = []
+    for user_id in user_ids:
+        if written >= watchlist:
+            break
+        size = min(titles, max(1, int(rng.lognormvariate(mu, 1.0))), watchlist - written)
+        picked = dict.fromkeys(rng.choices(movie_ids, cum_weights=title_weights, k=size * 2))
+        for movie_id in list(picked)[:size]:
+            status = weighted(rng, STATUSES)
+            rating = None
+            if status == "watched":
+                rating = min(10, max(1, round(rng.gauss(7.2, 1.6))))
+            elif status == "dropped" and rng.random() < 0.5:
+                rating = min(10, max(1, round(rng.gauss(4.0, 1.8))))
+            batch.append((user_id, movie_id, status, rating))
+        written += min(size, len(picked))
+        if len(batch) >= BATCH:
+            _insert_watchlist(connection, batch)
+            batch = []
+    _insert_watchlist(connection, batch)
+    log(f"  watchlist: {written} ({time.perf_counter() - started:.1f}s)")
+    return {"users": users, "titles": titles, "watchlist": written, "seed": seed}
+
+
+def _insert_watchlist(connection, rows):
+    with connection:
+        connection.executemany(
+            "INSERT INTO userwatchlist (user_id, movie_id, status, rating) VALUES (?, ?, ?, ?)", rows
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic watchlist dataset in SQLite.")
+    parser.add_argument("path", help="SQLite file to create")
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(f"Generating {args.preset} dataset into {args.path}")
+    generate(SQLiteClient(args.path), **PRESETS[args.preset], seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
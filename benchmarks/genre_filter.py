@@ -0,0 +1,69 @@
+import argparse
+import random
+import time
+
+import config
+from benchmarks.datagen import PRESETS, generate
+from dao.sqlite_backend import SQLiteClient
+
+GENRES = ["Drama", "Action", "Mecha", "Action, Drama"]
+
+
+def legacy_by_genre(user_id: str, genre: str):
+    # The query get_user_watchlist_by_genre ran before the inner join: the
+    # embed filter only nulls non-matching titles, so every entry comes back.
+    return (
+        config.get_supabase().table("userwatchlist").select("*, movies_shows(title, genre)")
+        .eq("user_id", user_id).eq("movies_shows.genre", genre).execute().data
+    )
+
+
+def timed(fn, args, repeat: int):
+    samples, size = [], 0
+    for arg in args[:repeat]:
+        start = time.perf_counter()
+        size += len(fn(*arg))
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, size / len(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the genre filter paths for a user's watchlist.")
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--db", help="existing SQLite dataset to read instead of generating one")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    client = SQLiteClient(args.db or ":memory:")
+    if not args.db:
+        print(f"Generating {args.preset} dataset")
+        generate(client, **PRESETS[args.preset], seed=args.seed)
+    config.set_client(client)
+
+    from services.watchlist_service import WatchlistService
+
+    service = WatchlistService()
+    service.slice_by_genre([], "Drama")
+    rng = random.Random(args.seed)
+    user_ids = [row[0] for row in client.connection.execute("SELECT DISTINCT user_id FROM userwatchlist")]
+    users = [rng.choice(user_ids) for _ in range(args.iterations)]
+    fetched = {user_id: service.get_user_watchlist_with_titles(user_id) for user_id in set(users)}
+
+    paths = {
+        "legacy embed filter": lambda u, g: legacy_by_genre(u, g),
+        "inner join": lambda u, g: service.get_user_watchlist_by_genre(u, g),
+        "fetch + genre index": lambda u, g: service.get_user_watchlist_by_genre(u, g, use_index=True),
+        "genre index on fetched rows": lambda u, g: service.slice_by_genre(fetched[u], g),
+    }
+    print(f"{'genre':<16}{'path':<30}{'p50 ms':>9}{'rows':>9}")
+    for genre in GENRES:
+        calls = [(u, genre) for u in users]
+        for name, fn in paths.items():
+            p50, rows = timed(fn, calls, args.iterations)
+            print(f"{genre:<16}{name:<30}{p50:>9.3f}{rows:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
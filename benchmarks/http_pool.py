@@ -0,0 +1,152 @@
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_client import HTTPSettings, create_http_client
+
+ROWS = [{"user_id": f"user-{i}", "name": f"User {i}", "email": f"user{i}@example.com"} for i in range(20)]
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the client can keep connections alive between requests.
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.record_connection()
+
+    def _reply(self, status: int, rows=None):
+        body = json.dumps(rows if rows is not None else {"message": "mock failure"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Range", f"0-{len(ROWS) - 1}/{len(ROWS)}")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        server = self.server
+        time.sleep(server.latency)
+        roll = random.random()
+        if roll < server.drop_rate:
+            # Close without answering, as a proxy recycling the connection would.
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        if roll < server.drop_rate + server.failure_rate:
+            self._reply(503)
+            return
+        self._reply(200, ROWS)
+
+    do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = _handle
+
+
+class MockServer(ThreadingHTTPServer):
+    # PostgREST stand-in on 127.0.0.1 with injectable latency and failures.
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, drop_rate: float = 0.0, port: int = 0):
+        super().__init__(("127.0.0.1", port), MockHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def run(server: MockServer, settings: HTTPSettings, threads: int, requests: int):
+    from supabase import ClientOptions, create_client
+
+    http = create_http_client(settings)
+    client = create_client(server.url, "mock-key", options=ClientOptions(httpx_client=http))
+    latencies, failures = [], 0
+
+    def call(_):
+        start = time.perf_counter()
+        try:
+            client.table("users").select("user_id, name").execute()
+            return time.perf_counter() - start, False
+        except Exception:
+            return time.perf_counter() - start, True
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for seconds, failed in pool.map(call, range(requests)):
+            latencies.append(seconds)
+            failures += failed
+    elapsed = time.perf_counter() - start
+    metrics = http._transport.metrics()
+    http.close()
+    latencies.sort()
+    return {
+        "requests": requests,
+        "failures": failures,
+        "seconds": elapsed,
+        "per_second": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "server_connections": server.connections,
+        **{f"pool_{k}": v for k, v in metrics.items() if k != "client"},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exercise the pooled Supabase HTTP client against a local mock server.")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds the mock server waits per request")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="share of requests answered with 503")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="share of connections closed without a reply")
+    parser.add_argument("--max-connections", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--retries", type=int, default=HTTPSettings.retries)
+    args = parser.parse_args()
+
+    print(f"{'pool':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'failed':>8}{'retries':>9}{'conns':>7}{'peak':>6}")
+    for max_connections in args.max_connections:
+        settings = HTTPSettings(
+            max_connections=max_connections,
+            max_keepalive=max_connections,
+            retries=args.retries,
+            backoff=0.01,
+            pool_timeout=30.0,
+        )
+        with MockServer(args.latency, args.failure_rate, args.drop_rate) as server:
+            row = run(server, settings, args.threads, args.requests)
+        print(
+            f"{max_connections:>5}{row['per_second']:>9.0f}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+            f"{row['failures']:>8}{row['pool_retries']:>9}{row['server_connections']:>7}{row['pool_peak_in_flight']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
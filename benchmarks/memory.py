@@ -0,0 +1,69 @@
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.datagen import PRESETS, generate
+from dao.models import Title, User, WatchlistEntry
+from dao.sqlite_backend import SQLiteClient
+
+# Each table is read back through the SQLite backend the way the DAOs read
+# it, so the dicts carry the same keys and value types as API rows.
+QUERIES = {
+    "users": (User, lambda client: client.table("users").select("*")),
+    "movies_shows": (Title, lambda client: client.table("movies_shows").select("*")),
+    "userwatchlist": (WatchlistEntry, lambda client: client.table("userwatchlist").select("*, movies_shows(title, type, genre)")),
+}
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def compare(client: SQLiteClient, rows: int):
+    report = {}
+    for table, (model, query) in QUERIES.items():
+        data = query(client).limit(rows).execute().data
+        # Copy the rows inside the measurement so both sides pay for their
+        # own containers; the column values are shared either way.
+        dicts, dict_bytes = measure(lambda: [dict(row) for row in data])
+        models, model_bytes = measure(lambda: model.from_rows(data))
+        n = len(data)
+        report[table] = {
+            "rows": n,
+            "dict_bytes_per_100k": dict_bytes * 100_000 // max(n, 1),
+            "model_bytes_per_100k": model_bytes * 100_000 // max(n, 1),
+            "ratio": model_bytes / dict_bytes if dict_bytes else float("nan"),
+        }
+        del dicts, models
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory held by dict rows and dao.models rows.")
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--db", help="existing SQLite dataset to read instead of generating one")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to load per table")
+    args = parser.parse_args()
+
+    client = SQLiteClient(args.db or ":memory:")
+    if not args.db:
+        print(f"Generating {args.preset} dataset")
+        generate(client, **PRESETS[args.preset])
+
+    print(f"{'table':<16}{'rows':>9}{'dict MB/100k':>15}{'model MB/100k':>15}{'ratio':>8}")
+    for table, row in compare(client, args.rows).items():
+        print(
+            f"{table:<16}{row['rows']:>9}{row['dict_bytes_per_100k'] / 2**20:>15.1f}"
+            f"{row['model_bytes_per_100k'] / 2**20:>15.1f}{row['ratio']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import config
+from benchmarks import cases
+from benchmarks.datagen import PRESETS, generate
+from dao.sqlite_backend import SQLiteClient
+
+SERVICE_CLASSES = ("UserService", "TitleService", "WatchlistService")
+HEAVY_ITERATIONS = 3
+
+
+class Context:
+    def __init__(self, seed: int):
+        from services.title_service import AsyncTitleService, TitleService
+        from services.user_service import AsyncUserService, UserService
+        from services.watchlist_service import AsyncWatchlistService, WatchlistService
+
+        self.rng = random.Random(seed)
+        self.user_service = UserService()
+        self.title_service = TitleService()
+        self.watchlist_service = WatchlistService()
+        self.async_user_service = AsyncUserService()
+        self.async_title_service = AsyncTitleService()
+        self.async_watchlist_service = AsyncWatchlistService()
+
+        connection = config.get_supabase().connection
+        users = connection.execute("SELECT user_id, email FROM users ORDER BY random() LIMIT 1000").fetchall()
+        self.user_ids = [row["user_id"] for row in users]
+        self.emails = [row["email"] for row in users]
+        self.movie_ids = [row[0] for row in connection.execute("SELECT movie_id FROM movies_shows ORDER BY random() LIMIT 5000")]
+        self.watchlist_ids = [row[0] for row in connection.execute("SELECT watchlist_id FROM userwatchlist ORDER BY random() LIMIT 5000")]
+        titles = [row[0] for row in connection.execute("SELECT title FROM movies_shows ORDER BY random() LIMIT 500")]
+        self.queries = [" ".join(t.split()[-2:]) for t in titles]
+        self.prefixes = [t[:3] for t in titles]
+
+
+def percentile(samples, q: float):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_case(ctx, name: str, iterations: int, max_error_rate: float = 0.5):
+    n = min(iterations, HEAVY_ITERATIONS) if name in cases.HEAVY else iterations
+    calls, cleanup = cases.CASES[name](ctx, n)
+    samples, errors = [], 0
+    started = time.perf_counter()
+    for call in calls:
+        start = time.perf_counter()
+        try:
+            result = call()
+            errors += isinstance(result, dict) and "error" in result
+        except Exception:
+            errors += 1
+        samples.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    if cleanup:
+        cleanup()
+    # Timings of calls that mostly fail measure the error path, not the
+    # method; such cases are reported as failed and never compared.
+    return {
+        "iterations": len(samples),
+        "errors": errors,
+        "failed": errors > max_error_rate * len(samples),
+        "ops_per_second": len(samples) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+    }
+
+
+def uncovered_methods():
+    from services.title_service import TitleService
+    from services.user_service import UserService
+    from services.watchlist_service import WatchlistService
+
+    missing = []
+    for cls in (UserService, TitleService, WatchlistService):
+        for name in dir(cls):
+            if not name.startswith("_") and callable(getattr(cls, name)) and f"{cls.__name__}.{name}" not in cases.CASES:
+                missing.append(f"{cls.__name__}.{name}")
+    return missing
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if result["failed"] or not before or not before["p50_ms"]:
+            continue
+        # Baselines saved before the failed flag existed count as failed
+        # when every call errored.
+        if before.get("failed", before["errors"] >= before["iterations"]):
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1
+        if change > threshold:
+            regressions.append((name, before["p50_ms"], result["p50_ms"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every service method against a synthetic SQLite dataset.")
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--db", default=":memory:", help="SQLite file; an existing file is reused as-is")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--only", help="run cases whose name contains this text")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--max-error-rate", type=float, default=0.5, help="share of erroring calls above which a case fails")
+    args = parser.parse_args()
+
+    reuse = args.db != ":memory:" and os.path.exists(args.db)
+    client = SQLiteClient(args.db)
+    config.set_client(client)
+    if reuse:
+        print(f"Reusing dataset in {args.db}")
+        dataset = {"path": args.db}
+    else:
+        print(f"Generating {args.preset} dataset (seed {args.seed})")
+        dataset = generate(client, **PRESETS[args.preset], seed=args.seed)
+
+    missing = uncovered_methods()
+    if missing:
+        print(f"Warning: no benchmark case for {', '.join(missing)}")
+
+    ctx = Context(args.seed)
+    results = {}
+    print(f"\n{'case':<58}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err':>5}")
+    for name in cases.CASES:
+        if args.only and args.only not in name:
+            continue
+        result = results[name] = run_case(ctx, name, args.iterations, args.max_error_rate)
+        if result["failed"]:
+            print(f"{name:<58}{'FAILED':>40}{result['errors']:>5}")
+            continue
+        print(f"{name:<58}{result['ops_per_second']:>10.1f}{result['p50_ms']:>10.3f}"
+              f"{result['p95_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['errors']:>5}")
+
+    report = {
+        "meta": {
+            "preset": args.preset,
+            "dataset": dataset,
+            "iterations": args.iterations,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved results to {args.output}")
+
+    failed = [name for name, result in results.items() if result["failed"]]
+    for name in failed:
+        print(f"FAILED {name}: {results[name]['errors']}/{results[name]['iterations']} calls errored")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: p50 {before:.3f} ms -> {after:.3f} ms (+{change:.0%})")
+        if not regressions:
+            print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
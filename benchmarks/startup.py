@@ -0,0 +1,66 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "config",
+    "dao.title_dao",
+    "services.title_service",
+    "services.user_service",
+    "services.watchlist_service",
+    "client.main",
+]
+
+
+def import_times(module: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return result.returncode, rows
+
+
+def dependencies(rows, module: str):
+    # -X importtime reports children before their parent, indented one level
+    # deeper, so a module's subtree is the run of indented rows preceding it.
+    index = next((i for i, r in enumerate(rows) if r[0].strip() == module), None)
+    if index is None:
+        return None, []
+    start = index
+    while start > 0 and rows[start - 1][0].startswith("  "):
+        start -= 1
+    return rows[index], [(r[0].strip(), r[1], r[2]) for r in rows[start:index]]
+
+
+def summarize(module: str, top: int):
+    returncode, rows = import_times(module)
+    target, deps = dependencies(rows, module)
+    total_ms = target[2] / 1000 if target else float("nan")
+    status = "ok" if returncode == 0 else f"failed ({returncode})"
+    print(f"{module}: {total_ms:.1f} ms cumulative [{status}]")
+    for name, _, cumulative_us in sorted(deps, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time with python -X importtime.")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--top", type=int, default=5, help="heaviest dependencies to list per module")
+    args = parser.parse_args()
+    for module in args.modules:
+        summarize(module, args.top)
+
+
+if __name__ == "__main__":
+    main()
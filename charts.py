@@ -0,0 +1,117 @@
+import io
+import os
+from functools import lru_cache
+
+CHART_RENDERER = os.getenv("CHART_RENDERER", "matplotlib")
+
+LABELS = ["Watched", "Planning", "Dropped"]
+GLOW_COLORS = ["#5168FF", "#6B8AFF", "#9550FF"]
+TRANSPARENT_COLORS = ["#4159D029", "#5A7FDB5A", "#7C3AED39"]  # 75% transparent
+
+
+@lru_cache(maxsize=128)
+def status_pie_png(watched: int, planning: int, dropped: int) -> bytes:
+    from matplotlib import patheffects
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(7, 6), facecolor='none')
+    FigureCanvasAgg(fig)
+    try:
+        ax = fig.subplots()
+        ax.set_facecolor('none')
+
+        sizes = [watched, planning, dropped]
+
+        for width, alpha in zip([4], [0.06]):
+            start_angle = 90
+            total = sum(sizes)
+            for size, glow_color in zip(sizes, GLOW_COLORS):
+                theta1 = start_angle
+                theta2 = start_angle + (size / total) * 360
+
+                ax.pie(
+                    [1],
+                    radius=1,
+                    startangle=theta1,
+                    colors=["none"],
+                    wedgeprops={
+                        'edgecolor': glow_color,
+                        'linewidth': width,
+                        'alpha': alpha
+                    }
+                )
+                start_angle = theta2
+
+        wedges, texts, autotexts = ax.pie(
+            sizes,
+            labels=LABELS,
+            autopct="%1.1f%%",
+            startangle=90,
+            colors=TRANSPARENT_COLORS,
+            wedgeprops={
+                'linewidth': 4,
+                'edgecolor': GLOW_COLORS[0],
+                'alpha': 0.75
+            }
+        )
+        for i, wedge in enumerate(wedges):
+            wedge.set_edgecolor(GLOW_COLORS[i])
+        for t in texts:
+            t.set_color('#ffffff')
+            t.set_fontsize(13)
+            t.set_fontweight('bold')
+            t.set_path_effects([patheffects.withStroke(linewidth=3, foreground='#000000')])
+
+        for autotext in autotexts:
+            autotext.set_color('#ffffff')
+            autotext.set_fontsize(12)
+            autotext.set_fontweight('bold')
+            autotext.set_path_effects([patheffects.withStroke(linewidth=2, foreground='#000000')])
+
+        ax.axis("equal")
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", transparent=True, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def status_pie_spec(watched: int, planning: int, dropped: int) -> dict:
+    return {
+        "data": {"values": [
+            {"status": label, "count": count}
+            for label, count in zip(LABELS, [watched, planning, dropped])
+        ]},
+        "mark": {"type": "arc", "innerRadius": 60, "stroke": "#667eea", "strokeWidth": 2},
+        "encoding": {
+            "theta": {"field": "count", "type": "quantitative"},
+            "color": {
+                "field": "status",
+                "type": "nominal",
+                "scale": {"domain": LABELS, "range": GLOW_COLORS},
+            },
+            "tooltip": [
+                {"field": "status", "type": "nominal"},
+                {"field": "count", "type": "quantitative"},
+            ],
+        },
+        "background": None,
+    }
+
+
+def bar_spec(counts: dict, category: str, value: str = "count", percent: bool = False) -> dict:
+    return {
+        "data": {"values": [{category: str(key), value: count} for key, count in counts.items()]},
+        "mark": {"type": "bar", "cornerRadiusEnd": 4, "color": GLOW_COLORS[0]},
+        "encoding": {
+            "x": {"field": category, "type": "nominal", "sort": None, "axis": {"labelAngle": -45}},
+            "y": {"field": value, "type": "quantitative", "axis": {"format": ".0%"} if percent else {}},
+            "tooltip": [
+                {"field": category, "type": "nominal"},
+                {"field": value, "type": "quantitative", "format": ".1%" if percent else ","},
+            ],
+        },
+        "background": None,
+    }
@@ -1,12 +1,25 @@
 from services.user_service import UserService
 from services.title_service import TitleService
 from services.watchlist_service import WatchlistService
+from services.title_import import TitleImporter
 
 user_service = UserService()
 title_service = TitleService()
 watchlist_service = WatchlistService()
 
 
+def print_rows(rows):
+    count = 0
+    for row in rows:
+        print(row)
+        count += 1
+    print(f"({count} rows)")
+
+
+def split_ids(text):
+    return [part.strip() for part in text.split(",") if part.strip()]
+
+
 def menu():
     while True:
         print("\nWatchlist Manager - Main Menu")
@@ -22,12 +35,16 @@ def menu():
         print("8. Search Titles")
         print("9. Update Title")
         print("10. Delete Title")
+        print("16. Bulk Import Titles (CSV/JSONL)")
         print("\n---- WATCHLIST MANAGEMENT ----")
         print("11. Add to Watchlist")
         print("12. Get User Watchlist")
         print("13. Get User Watchlist by Status")
         print("14. Update Watchlist Entry")
         print("15. Remove from Watchlist")
+        print("17. Bulk Add to Watchlist")
+        print("18. Bulk Update Watchlist Entries")
+        print("19. Bulk Remove from Watchlist")
         print("\n0. Exit")
 
         choice = input("\nEnter your choice: ")
@@ -38,7 +55,7 @@ def menu():
             print(user_service.create_user(name, email))
 
         elif choice == "2":
-            print(user_service.list_users())
+            print_rows(user_service.iter_users())
 
         elif choice == "3":
             user_id = input("Enter User ID: ")
@@ -61,7 +78,7 @@ def menu():
             print(title_service.add_title(title, t_type, genre))
 
         elif choice == "7":
-            print(title_service.list_all_titles())
+            print_rows(title_service.iter_titles())
 
         elif choice == "8":
             query = input("Enter title/genre keyword: ")
@@ -77,6 +94,22 @@ def menu():
             movie_id = input("Enter Movie/Show ID: ")
             print(title_service.delete_title(movie_id))
 
+        elif choice == "16":
+            path = input("Enter path to CSV or JSONL file: ")
+            chunk_size = input("Enter chunk size (default 500): ") or "500"
+            if not chunk_size.isdigit() or int(chunk_size) < 1:
+                print("❌ Chunk size must be a positive number.")
+                continue
+            try:
+                stats = TitleImporter(title_service, int(chunk_size)).run(
+                    path,
+                    progress=lambda s: print(f"  {s['read']} read, {s['inserted']} inserted, {s['rejected']} rejected ({s['rows_per_second']:.0f} rows/s)"),
+                )
+            except Exception as e:
+                print(f"❌ Import stopped: {e}. Run it again to resume from the checkpoint.")
+            else:
+                print(stats)
+
         elif choice == "11":
             user_id = input("Enter User ID: ")
             movie_id = input("Enter Movie/Show ID: ")
@@ -87,7 +120,7 @@ def menu():
 
         elif choice == "12":
             user_id = input("Enter User ID: ")
-            print(watchlist_service.get_user_watchlist(user_id))
+            print_rows(watchlist_service.iter_user_watchlist(user_id))
 
         elif choice == "13":
             user_id = input("Enter User ID: ")
@@ -105,6 +138,23 @@ def menu():
             watchlist_id = input("Enter Watchlist ID: ")
             print(watchlist_service.remove_from_watchlist(watchlist_id))
 
+        elif choice == "17":
+            user_id = input("Enter User ID: ")
+            movie_ids = split_ids(input("Enter Movie/Show IDs (comma separated): "))
+            status = input("Enter status (watched/planning/dropped): ")
+            print(watchlist_service.add_many(user_id, movie_ids, status))
+
+        elif choice == "18":
+            watchlist_ids = split_ids(input("Enter Watchlist IDs (comma separated): "))
+            status = input("Enter new status (leave blank to skip): ") or None
+            rating = input("Enter new rating (leave blank to skip): ") or None
+            review = input("Enter new review (leave blank to skip): ") or None
+            print(watchlist_service.update_many(watchlist_ids, status, rating, review))
+
+        elif choice == "19":
+            watchlist_ids = split_ids(input("Enter Watchlist IDs (comma separated): "))
+            print(watchlist_service.remove_many(watchlist_ids))
+
         elif choice == "0":
             print("👋 Exiting Watchlist Manager. Goodbye!")
             break
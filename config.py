@@ -1,15 +1,81 @@
 import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import threading
 
-# Load environment variables from .env
-load_dotenv()
+_client = None
+_client_lock = threading.Lock()
+_async_client = None
+_async_client_lock = None
 
-SUPABASE_URL: str = os.getenv("SUPABASE_URL")
-SUPABASE_KEY: str = os.getenv("SUPABASE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError(" Supabase credentials not found. Please check your .env file.")
+def _load_env():
+    from dotenv import load_dotenv
 
+    # Load environment variables from .env
+    load_dotenv()
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def _credentials():
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+
+    if not url or not key:
+        raise ValueError(" Supabase credentials not found. Please check your .env file.")
+    return url, key
+
+
+def _backend():
+    # STORAGE_BACKEND=sqlite runs every DAO against a local SQLite file
+    # (SQLITE_PATH, default watchlist.db) instead of Supabase.
+    return os.getenv("STORAGE_BACKEND", "supabase").lower()
+
+
+def set_client(client):
+    # Install a ready-made client, e.g. a SQLiteClient for tests/benchmarks.
+    global _client, _async_client
+    with _client_lock:
+        _client = client
+        _async_client = client.as_async() if hasattr(client, "as_async") else None
+
+
+def get_supabase():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _load_env()
+                if _backend() == "sqlite":
+                    from dao.sqlite_backend import SQLiteClient
+
+                    _client = SQLiteClient(os.getenv("SQLITE_PATH", "watchlist.db"))
+                else:
+                    from supabase import ClientOptions, create_client
+
+                    from http_client import create_http_client
+
+                    _client = create_client(*_credentials(), options=ClientOptions(httpx_client=create_http_client()))
+    return _client
+
+
+async def get_async_supabase():
+    # The async client is bound to the event loop that created it; the app
+    # only awaits it from the page loader's background loop.
+    global _async_client, _async_client_lock
+    if _async_client is None:
+        import asyncio
+
+        if _async_client_lock is None:
+            _async_client_lock = asyncio.Lock()
+        async with _async_client_lock:
+            if _async_client is None:
+                _load_env()
+                if _backend() == "sqlite":
+                    _async_client = get_supabase().as_async()
+                else:
+                    from supabase import AsyncClientOptions, acreate_client
+
+                    from http_client import create_async_http_client
+
+                    _async_client = await acreate_client(
+                        *_credentials(), options=AsyncClientOptions(httpx_client=create_async_http_client())
+                    )
+    return _async_client
@@ -0,0 +1,83 @@
+from dao.cache import TTLCache
+from dao.projections import columns
+from dao.title_dao import TitleDAO
+
+# One cache per process so writes made through any CachedTitleDAO
+# invalidate reads made through every other instance.
+title_cache = TTLCache(maxsize=2048)
+
+TTLS = {
+    "list_titles": 60.0,
+    "get_title_by_id": 300.0,
+    "list_genres": 600.0,
+    "count_titles": 60.0,
+}
+
+
+class CachedTitleDAO(TitleDAO):
+    def __init__(self, cache: TTLCache = None, ttls: dict = None, models: bool = None):
+        super().__init__(models)
+        self.cache = cache or title_cache
+        self.ttls = {**TTLS, **(ttls or {})}
+
+    def get_title_by_id(self, movie_id: str, fields=None):
+        return self.cache.get_or_load(
+            ("get_title_by_id", movie_id, columns(self.table, fields), self.models),
+            lambda: super(CachedTitleDAO, self).get_title_by_id(movie_id, fields),
+            self.ttls["get_title_by_id"],
+        )
+
+    def list_titles(self, fields=None):
+        return self.cache.get_or_load(
+            ("list_titles", columns(self.table, fields), self.models),
+            lambda: super(CachedTitleDAO, self).list_titles(fields),
+            self.ttls["list_titles"],
+        )
+
+    def list_genres(self):
+        return self.cache.get_or_load(
+            ("list_genres",),
+            lambda: super(CachedTitleDAO, self).list_genres(),
+            self.ttls["list_genres"],
+        )
+
+    def count_titles(self, count: str = "exact"):
+        return self.cache.get_or_load(
+            ("count_titles", count),
+            lambda: super(CachedTitleDAO, self).count_titles(count),
+            self.ttls["count_titles"],
+        )
+
+    def add_title(self, title: str, type_: str, genre=None):
+        rows = super().add_title(title, type_, genre)
+        self._invalidate(rows)
+        return rows
+
+    def add_titles(self, rows):
+        rows = super().add_titles(rows)
+        self._invalidate(rows)
+        return rows
+
+    def update_title(self, movie_id: str, title: str = None, type_: str = None, genre: str = None):
+        rows = super().update_title(movie_id, title, type_, genre)
+        self._invalidate(rows, movie_id)
+        return rows
+
+    def delete_title(self, movie_id: str):
+        rows = super().delete_title(movie_id)
+        self._invalidate(rows, movie_id)
+        return rows
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+    def _invalidate(self, rows, movie_id: str = None):
+        self.cache.invalidate_prefix(("list_titles",))
+        self.cache.invalidate(("list_genres",))
+        self.cache.invalidate_prefix(("count_titles",))
+        movie_ids = {row["movie_id"] for row in rows if "movie_id" in row} if isinstance(rows, list) else set()
+        if movie_id is not None:
+            movie_ids.add(movie_id)
+        # One pass over the cache however many rows a batch insert returned.
+        if movie_ids:
+            self.cache.invalidate_where(lambda key: key[0] == "get_title_by_id" and key[1] in movie_ids)
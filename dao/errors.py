@@ -0,0 +1,14 @@
+import re
+
+from postgrest.exceptions import APIError
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+_KEY_RE = re.compile(r"Key \((\w+)\)=\((.*?)\)")
+
+
+def foreign_key_violation(error: APIError):
+    if getattr(error, "code", None) != FOREIGN_KEY_VIOLATION:
+        return None
+    match = _KEY_RE.search(error.details or "")
+    return (match.group(1), match.group(2)) if match else (None, None)
@@ -0,0 +1,199 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLE_SIZE = 1024
+MAX_REQUESTS = 50
+
+current_request = contextvars.ContextVar("dao_request", default=None)
+
+
+def _row_count(result):
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    return len(result) if isinstance(result, list) else 0
+
+
+def _percentile(samples, q: float):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MethodStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def record(self, seconds: float, rows: int, error: bool):
+        self.calls += 1
+        self.errors += error
+        self.rows += rows
+        self.seconds += seconds
+        self.samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "seconds": self.seconds,
+            "p50_ms": _percentile(self.samples, 0.50) * 1000,
+            "p95_ms": _percentile(self.samples, 0.95) * 1000,
+            "p99_ms": _percentile(self.samples, 0.99) * 1000,
+        }
+
+
+class DAOMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._classes = []
+        self._originals = {}
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._methods = {}
+            self._requests = OrderedDict()
+
+    def register(self, cls):
+        self._classes.append(cls)
+        if self.enabled:
+            self._wrap(cls)
+        return cls
+
+    def enable(self):
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+        for cls in self._classes:
+            self._wrap(cls)
+
+    def disable(self):
+        with self._lock:
+            self.enabled = False
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals.clear()
+
+    @contextmanager
+    def request_scope(self, request_id: str = None):
+        token = current_request.set(request_id or uuid.uuid4().hex[:12])
+        try:
+            yield current_request.get()
+        finally:
+            current_request.reset(token)
+
+    def record(self, method: str, seconds: float, rows: int, error: bool):
+        request_id = current_request.get()
+        with self._lock:
+            self._methods.setdefault(method, MethodStats()).record(seconds, rows, error)
+            if request_id is not None:
+                request = self._requests.get(request_id)
+                if request is None:
+                    request = self._requests[request_id] = {}
+                    while len(self._requests) > MAX_REQUESTS:
+                        self._requests.popitem(last=False)
+                request.setdefault(method, MethodStats()).record(seconds, rows, error)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "methods": {name: stats.to_dict() for name, stats in self._methods.items()},
+                "requests": {
+                    request_id: {name: stats.to_dict() for name, stats in methods.items()}
+                    for request_id, methods in self._requests.items()
+                },
+            }
+
+    def request_snapshot(self, request_id: str):
+        with self._lock:
+            methods = self._requests.get(request_id, {})
+            return {name: stats.to_dict() for name, stats in methods.items()}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        with self._lock:
+            methods = sorted((name, f'method="{name}"', stats) for name, stats in self._methods.items())
+            lines = []
+            for family, field in (("dao_calls_total", "calls"), ("dao_errors_total", "errors"), ("dao_rows_total", "rows")):
+                lines.append(f"# TYPE {family} counter")
+                lines.extend(f"{family}{{{label}}} {getattr(stats, field)}" for _, label, stats in methods)
+            lines.append("# TYPE dao_latency_seconds histogram")
+            for _, label, stats in methods:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'dao_latency_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'dao_latency_seconds_bucket{{{label},le="+Inf"}} {stats.calls}')
+                lines.append(f"dao_latency_seconds_sum{{{label}}} {stats.seconds}")
+                lines.append(f"dao_latency_seconds_count{{{label}}} {stats.calls}")
+        return "\n".join(lines) + "\n"
+
+    def _wrap(self, cls):
+        for name, attr in list(vars(cls).items()):
+            # iter_* helpers are lazy; the *_page calls they make are timed.
+            if name.startswith(("_", "iter_")) or not inspect.isfunction(attr):
+                continue
+            if (cls, name) in self._originals:
+                continue
+            self._originals[(cls, name)] = attr
+            setattr(cls, name, self._timed(f"{cls.__name__}.{name}", attr))
+
+    def _timed(self, method: str, fn):
+        record = self.record
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    record(method, time.perf_counter() - start, 0, True)
+                    raise
+                record(method, time.perf_counter() - start, _row_count(result), False)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                record(method, time.perf_counter() - start, 0, True)
+                raise
+            record(method, time.perf_counter() - start, _row_count(result), False)
+            return result
+        return wrapper
+
+
+metrics = DAOMetrics()
+instrument = metrics.register
+
+if os.getenv("DAO_METRICS", "").lower() in ("1", "true", "yes"):
+    metrics.enable()
@@ -0,0 +1,98 @@
+import os
+from dataclasses import asdict, dataclass
+
+# DAOs return plain dicts unless asked for models, either per instance or
+# process-wide with DAO_ROW_MODELS=1.
+ROW_MODELS = os.getenv("DAO_ROW_MODELS") == "1"
+
+
+class Row:
+    # Slotted record that still answers the dict lookups the UI uses.
+
+    __slots__ = ()
+    # Fields copied from an embedded resource rather than stored in the table.
+    embedded = ()
+
+    @classmethod
+    def from_row(cls, row: dict):
+        return cls(*map(row.get, cls.__slots__))
+
+    @classmethod
+    def from_rows(cls, rows):
+        from_row = cls.from_row
+        return [from_row(row) for row in rows]
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def to_dict(self):
+        return asdict(self)
+
+    def to_record(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name not in self.embedded}
+
+
+@dataclass(slots=True)
+class User(Row):
+    user_id: str = None
+    name: str = None
+    email: str = None
+    password: str = None
+    profile_pic: str = None
+
+
+@dataclass(slots=True)
+class Title(Row):
+    movie_id: int = None
+    title: str = None
+    type: str = None
+    genre: str = None
+
+
+@dataclass(slots=True)
+class WatchlistEntry(Row):
+    watchlist_id: int = None
+    user_id: str = None
+    movie_id: int = None
+    status: str = None
+    rating: int = None
+    review: str = None
+    title: str = None
+    type: str = None
+    genre: str = None
+
+    embedded = ("title", "type", "genre")
+
+    @classmethod
+    def from_row(cls, row: dict):
+        # Embedded movies_shows columns are flattened onto the entry, the
+        # same shape services.watchlist_service.flatten_titles produces.
+        embed = row.get("movies_shows") or {}
+        return cls(
+            row.get("watchlist_id"),
+            row.get("user_id"),
+            row.get("movie_id"),
+            row.get("status"),
+            row.get("rating"),
+            row.get("review"),
+            embed.get("title"),
+            embed.get("type"),
+            embed.get("genre"),
+        )
+
+
+def use_models(models: bool = None):
+    return ROW_MODELS if models is None else models
@@ -0,0 +1,18 @@
+DEFAULT_PAGE_SIZE = 500
+
+
+def keyset_page(query, key: str, after=None, limit: int = DEFAULT_PAGE_SIZE):
+    if after is not None:
+        query = query.gt(key, after)
+    rows = query.order(key).limit(limit).execute().data
+    next_cursor = rows[-1][key] if len(rows) == limit else None
+    return rows, next_cursor
+
+
+def iter_pages(fetch_page, page_size: int = DEFAULT_PAGE_SIZE, after=None):
+    cursor = after
+    while True:
+        rows, cursor = fetch_page(after=cursor, limit=page_size)
+        yield from rows
+        if cursor is None:
+            return
@@ -0,0 +1,38 @@
+# Named column sets per table, so each caller asks PostgREST for just the
+# columns it renders instead of select("*").
+PROJECTIONS = {
+    "users": {
+        "id": "user_id",
+        "auth": "user_id, name, email, password, profile_pic",
+        "profile": "user_id, name, email, profile_pic",
+        "list": "user_id, name, email",
+        "detail": "*",
+    },
+    "movies_shows": {
+        "option": "movie_id, title",
+        "list": "movie_id, title, type",
+        "genre": "movie_id, genre",
+        "search": "movie_id, title, type, genre",
+        "detail": "*",
+    },
+    "userwatchlist": {
+        "list": "watchlist_id, movie_id, status, rating",
+        "page": "watchlist_id, movie_id, status, rating, movies_shows(title)",
+        "with_titles": "*, movies_shows(title, type, genre)",
+        "analytics": "watchlist_id, user_id, movie_id, status, rating, movies_shows(type, genre)",
+        "detail": "*",
+    },
+}
+
+
+def columns(table: str, fields=None, required: str = None):
+    if fields is None:
+        return "*"
+    if isinstance(fields, str):
+        fields = PROJECTIONS[table].get(fields, fields)
+    else:
+        fields = ", ".join(fields)
+    # Keyset pagination reads the cursor column from each page.
+    if required and fields != "*" and required not in [f.strip() for f in fields.split(",")]:
+        fields = f"{required}, {fields}"
+    return fields
@@ -0,0 +1,477 @@
+import asyncio
+import re
+import sqlite3
+import threading
+
+from postgrest.exceptions import APIError
+
+# A local stand-in for the Supabase client. It implements the part of the
+# PostgREST query-builder interface the DAOs use (table/select/filters/
+# order/range/insert/update/upsert/delete/rpc), so every DAO runs unchanged
+# against a SQLite file or :memory: database.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+    name TEXT,
+    email TEXT NOT NULL,
+    password TEXT,
+    profile_pic TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS movies_shows (
+    movie_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    type TEXT NOT NULL,
+    genre TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_movies_shows_title ON movies_shows (title);
+
+CREATE TABLE IF NOT EXISTS userwatchlist (
+    watchlist_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL REFERENCES users (user_id) ON DELETE CASCADE,
+    movie_id INTEGER NOT NULL REFERENCES movies_shows (movie_id) ON DELETE CASCADE,
+    status TEXT NOT NULL DEFAULT 'planning',
+    rating INTEGER,
+    review TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_userwatchlist_user_status ON userwatchlist (user_id, status);
+CREATE INDEX IF NOT EXISTS idx_userwatchlist_movie_id ON userwatchlist (movie_id);
+CREATE INDEX IF NOT EXISTS idx_userwatchlist_status ON userwatchlist (status);
+"""
+
+# table -> {column: (referenced table, referenced column)}
+FOREIGN_KEYS = {
+    "userwatchlist": {
+        "user_id": ("users", "user_id"),
+        "movie_id": ("movies_shows", "movie_id"),
+    },
+}
+
+OPERATORS = {
+    "eq": "=",
+    "neq": "!=",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+    "ilike": "LIKE",
+}
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_EMBED_RE = re.compile(r"^(\w+)(!inner)?\((.*)\)$")
+
+
+def _quote(name: str):
+    if not _IDENTIFIER_RE.match(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f'"{name}"'
+
+
+def _split_top_level(text: str):
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _distinct_genres(connection):
+    genres = set()
+    for (genre,) in connection.execute("SELECT genre FROM movies_shows WHERE genre IS NOT NULL"):
+        genres.update(part.strip() for part in genre.split(",") if part.strip())
+    return [{"distinct_genres": genre} for genre in sorted(genres)]
+
+
+FUNCTIONS = {
+    "distinct_genres": _distinct_genres,
+}
+
+
+class SQLiteResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class SQLiteAuth:
+    def get_session(self):
+        return None
+
+
+class SQLiteCall:
+    def __init__(self, client, name: str):
+        self.client = client
+        self.name = name
+
+    def execute(self):
+        return self.client._call(self.name)
+
+
+class AsyncSQLiteCall(SQLiteCall):
+    async def execute(self):
+        return await asyncio.to_thread(self.client._call, self.name)
+
+
+class SQLiteQuery:
+    def __init__(self, client, table: str):
+        self.client = client
+        self.table = table
+        self.method = "select"
+        self.columns = "*"
+        self.count_mode = None
+        self.head = False
+        self.payload = None
+        self.on_conflict = None
+        self.filters = []
+        self.or_filters = []
+        self.ordering = []
+        self.limit_count = None
+        self.offset_count = None
+
+    def select(self, *columns, count: str = None, head: bool = False):
+        self.method = "select"
+        self.columns = ",".join(columns) or "*"
+        self.count_mode = count
+        self.head = head
+        return self
+
+    def insert(self, json):
+        self.method = "insert"
+        self.payload = json
+        return self
+
+    def upsert(self, json, on_conflict: str = None):
+        self.method = "upsert"
+        self.payload = json
+        self.on_conflict = on_conflict
+        return self
+
+    def update(self, json):
+        self.method = "update"
+        self.payload = json
+        return self
+
+    def delete(self):
+        self.method = "delete"
+        return self
+
+    def _filter(self, column: str, operator: str, value):
+        self.filters.append((column, operator, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+
+    def in_(self, column, values):
+        return self._filter(column, "in", list(values))
+
+    def is_(self, column, value):
+        return self._filter(column, "is", value)
+
+    def or_(self, filters: str, reference_table: str = None):
+        group = []
+        for part in _split_top_level(filters):
+            column, operator, value = part.split(".", 2)
+            if len(value) > 1 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            group.append((column, operator, value))
+        self.or_filters.append((reference_table, group))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, size: int):
+        self.limit_count = size
+        return self
+
+    def range(self, start: int, end: int):
+        self.offset_count = start
+        self.limit_count = end - start + 1
+        return self
+
+    def execute(self):
+        return self.client._run(self)
+
+
+class SQLiteClient:
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.RLock()
+        self.auth = SQLiteAuth()
+
+    def table(self, name: str):
+        return SQLiteQuery(self, name)
+
+    def from_(self, name: str):
+        return self.table(name)
+
+    def rpc(self, name: str, params: dict = None):
+        return SQLiteCall(self, name)
+
+    def as_async(self):
+        return AsyncSQLiteClient(self)
+
+    def close(self):
+        self.connection.close()
+
+    def _call(self, name: str):
+        with self.lock:
+            return SQLiteResponse(FUNCTIONS[name](self.connection))
+
+    def _run(self, query: SQLiteQuery):
+        with self.lock:
+            try:
+                with self.connection:
+                    return getattr(self, f"_{query.method}")(query)
+            except sqlite3.IntegrityError as e:
+                raise self._api_error(query, e) from e
+
+    def _select(self, query: SQLiteQuery):
+        columns, joins, embeds = self._projection(query)
+        where, params = self._where(query, embeds)
+        count = None
+        if query.count_mode:
+            count = self.connection.execute(
+                f"SELECT COUNT(*) FROM {_quote(query.table)}{joins}{where}", params
+            ).fetchone()[0]
+        if query.head:
+            return SQLiteResponse([], count)
+
+        sql = f"SELECT {', '.join(columns)} FROM {_quote(query.table)}{joins}{where}"
+        if query.ordering:
+            sql += " ORDER BY " + ", ".join(
+                f"{self._column(query.table, c, embeds)} {'DESC' if desc else 'ASC'}" for c, desc in query.ordering
+            )
+        if query.limit_count is not None or query.offset_count is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [-1 if query.limit_count is None else query.limit_count, query.offset_count or 0]
+        rows = self.connection.execute(sql, params).fetchall()
+        return SQLiteResponse([self._nest(row, embeds) for row in rows], count)
+
+    def _insert(self, query: SQLiteQuery, on_conflict: str = None):
+        rows = query.payload if isinstance(query.payload, list) else [query.payload]
+        inserted = []
+        for row in rows:
+            names = list(row)
+            sql = (
+                f"INSERT INTO {_quote(query.table)} ({', '.join(map(_quote, names))}) "
+                f"VALUES ({', '.join('?' for _ in names)})"
+            )
+            if on_conflict:
+                updates = [n for n in names if n != on_conflict]
+                action = (
+                    "DO UPDATE SET " + ", ".join(f"{_quote(n)} = excluded.{_quote(n)}" for n in updates)
+                    if updates else "DO NOTHING"
+                )
+                sql += f" ON CONFLICT ({_quote(on_conflict)}) {action}"
+            cursor = self.connection.execute(sql + " RETURNING *", [row[n] for n in names])
+            inserted.extend(dict(r) for r in cursor.fetchall())
+        return SQLiteResponse(inserted)
+
+    def _upsert(self, query: SQLiteQuery):
+        return self._insert(query, on_conflict=query.on_conflict or self._primary_key(query.table))
+
+    def _update(self, query: SQLiteQuery):
+        where, params = self._where(query, {})
+        names = list(query.payload)
+        assignments = ", ".join(f"{_quote(n)} = ?" for n in names)
+        cursor = self.connection.execute(
+            f"UPDATE {_quote(query.table)} SET {assignments}{where} RETURNING *",
+            [query.payload[n] for n in names] + params,
+        )
+        return SQLiteResponse([dict(r) for r in cursor.fetchall()])
+
+    def _delete(self, query: SQLiteQuery):
+        where, params = self._where(query, {})
+        cursor = self.connection.execute(f"DELETE FROM {_quote(query.table)}{where} RETURNING *", params)
+        return SQLiteResponse([dict(r) for r in cursor.fetchall()])
+
+    def _projection(self, query: SQLiteQuery):
+        columns, joins, embeds = [], [], {}
+        for item in _split_top_level(query.columns):
+            embed = _EMBED_RE.match(item)
+            if embed is None:
+                columns.append(f"{_quote(query.table)}.*" if item == "*" else self._column(query.table, item, {}))
+                continue
+            relation, inner, embed_columns = embed.groups()
+            local, remote = self._relation(query.table, relation)
+            alias = f"__{relation}"
+            names = [c.strip() for c in embed_columns.split(",") if c.strip()]
+            if names == ["*"]:
+                names = [r[1] for r in self.connection.execute(f"PRAGMA table_info({_quote(relation)})")]
+            embeds[relation] = {"alias": alias, "columns": names, "inner": bool(inner)}
+            on, on_params = self._embedded_filters(query, relation, alias)
+            join_type = "JOIN" if inner else "LEFT JOIN"
+            joins.append((
+                f" {join_type} {_quote(relation)} AS {_quote(alias)} "
+                f"ON {_quote(alias)}.{_quote(remote)} = {_quote(query.table)}.{_quote(local)}{on}",
+                on_params,
+            ))
+            columns.append(f"{_quote(alias)}.{_quote(remote)} AS {_quote(alias + '__key')}")
+            columns.extend(f"{_quote(alias)}.{_quote(c)} AS {_quote(alias + '__' + c)}" for c in names)
+        embeds["__params__"] = [p for _, ps in joins for p in ps]
+        return columns, "".join(sql for sql, _ in joins), embeds
+
+    def _embedded_filters(self, query: SQLiteQuery, relation: str, alias: str):
+        # Filters on an embedded resource narrow the embed, not the parent
+        # rows (unless the embed is !inner), exactly as PostgREST does; so
+        # they belong in the JOIN condition.
+        clauses, params = [], []
+        for column, operator, value in query.filters:
+            if column.startswith(f"{relation}."):
+                clause, clause_params = self._condition(f"{_quote(alias)}.{_quote(column.split('.', 1)[1])}", operator, value)
+                clauses.append(clause)
+                params.extend(clause_params)
+        for reference_table, group in query.or_filters:
+            if reference_table == relation:
+                parts = []
+                for column, operator, value in group:
+                    clause, clause_params = self._condition(f"{_quote(alias)}.{_quote(column)}", operator, value)
+                    parts.append(clause)
+                    params.extend(clause_params)
+                clauses.append("(" + " OR ".join(parts) + ")")
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def _where(self, query: SQLiteQuery, embeds):
+        clauses, params = [], list(embeds.get("__params__", []))
+        for column, operator, value in query.filters:
+            if "." in column:
+                continue
+            clause, clause_params = self._condition(self._column(query.table, column, embeds), operator, value)
+            clauses.append(clause)
+            params.extend(clause_params)
+        for reference_table, group in query.or_filters:
+            if reference_table is not None:
+                continue
+            parts = []
+            for column, operator, value in group:
+                clause, clause_params = self._condition(self._column(query.table, column, embeds), operator, value)
+                parts.append(clause)
+                params.extend(clause_params)
+            clauses.append("(" + " OR ".join(parts) + ")")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _condition(self, column: str, operator: str, value):
+        if operator == "in":
+            if not value:
+                return "0", []
+            return f"{column} IN ({', '.join('?' for _ in value)})", list(value)
+        if operator == "is":
+            keyword = {None: "NULL", "null": "NULL", True: "TRUE", "true": "TRUE", False: "FALSE", "false": "FALSE"}[value]
+            return f"{column} IS {keyword}", []
+        if operator in ("like", "ilike"):
+            value = value.replace("*", "%")
+        return f"{column} {OPERATORS[operator]} ?", [value]
+
+    def _column(self, table: str, column: str, embeds):
+        if "." in column:
+            relation, name = column.split(".", 1)
+            return f"{_quote(embeds[relation]['alias'])}.{_quote(name)}"
+        return f"{_quote(table)}.{_quote(column)}"
+
+    def _nest(self, row, embeds):
+        data = {}
+        nested = {}
+        for key in row.keys():
+            if key.startswith("__"):
+                relation, _, column = key[2:].partition("__")
+                nested.setdefault(relation, {})[column] = row[key]
+            else:
+                data[key] = row[key]
+        for relation, values in nested.items():
+            key = values.pop("key")
+            data[relation] = None if key is None else values
+        return data
+
+    def _relation(self, table: str, relation: str):
+        for column, (target, target_column) in FOREIGN_KEYS.get(table, {}).items():
+            if target == relation:
+                return column, target_column
+        raise ValueError(f"No relationship between {table} and {relation}")
+
+    def _primary_key(self, table: str):
+        for row in self.connection.execute(f"PRAGMA table_info({_quote(table)})"):
+            if row["pk"]:
+                return row["name"]
+        raise ValueError(f"{table} has no primary key")
+
+    def _api_error(self, query: SQLiteQuery, error: sqlite3.IntegrityError):
+        # Report foreign key failures the way PostgREST does, so callers
+        # that map 23503 errors behave the same on both backends.
+        if "FOREIGN KEY" in str(error):
+            rows = query.payload if isinstance(query.payload, list) else [query.payload or {}]
+            for column, (target, target_column) in FOREIGN_KEYS.get(query.table, {}).items():
+                for row in rows:
+                    if column not in row:
+                        continue
+                    found = self.connection.execute(
+                        f"SELECT 1 FROM {_quote(target)} WHERE {_quote(target_column)} = ?", [row[column]]
+                    ).fetchone()
+                    if found is None:
+                        return APIError({
+                            "code": "23503",
+                            "message": f'insert or update on table "{query.table}" violates foreign key constraint',
+                            "details": f'Key ({column})=({row[column]}) is not present in table "{target}".',
+                            "hint": None,
+                        })
+            return APIError({"code": "23503", "message": str(error), "details": None, "hint": None})
+        return APIError({"code": "23505" if "UNIQUE" in str(error) else "23000", "message": str(error), "details": None, "hint": None})
+
+
+class AsyncSQLiteQuery(SQLiteQuery):
+    async def execute(self):
+        return await asyncio.to_thread(self.client._run, self)
+
+
+class AsyncSQLiteClient:
+    def __init__(self, client: SQLiteClient):
+        self.client = client
+        self.auth = client.auth
+
+    def table(self, name: str):
+        return AsyncSQLiteQuery(self.client, name)
+
+    def from_(self, name: str):
+        return self.table(name)
+
+    def rpc(self, name: str, params: dict = None):
+        return AsyncSQLiteCall(self.client, name)
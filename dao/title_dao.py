@@ -1,9 +1,23 @@
-from config import supabase
+from config import get_async_supabase, get_supabase
+from dao.instrumentation import instrument
+from dao.models import Title, use_models
+from dao.projections import columns
+from dao.pagination import DEFAULT_PAGE_SIZE, iter_pages, keyset_page
 
+@instrument
 class TitleDAO:
-    def __init__(self):
-        self.supabase = supabase
+    model = Title
+
+    def __init__(self, models: bool = None):
         self.table = "movies_shows"
+        self.models = use_models(models)
+
+    def _rows(self, rows):
+        return self.model.from_rows(rows) if self.models else rows
+
+    @property
+    def supabase(self):
+        return get_supabase()
 
     def add_title(self, title: str, type_: str, genre=None):
         return self.supabase.table(self.table).insert({
@@ -12,14 +26,42 @@ class TitleDAO:
             "genre": genre
         }).execute().data
 
-    def get_title_by_id(self, movie_id: str):
-        return self.supabase.table(self.table).select("*").eq("movie_id", movie_id).execute().data
+    def add_titles(self, rows):
+        if not rows:
+            return []
+        return self.supabase.table(self.table).insert(rows).execute().data
+
+    def get_title_by_id(self, movie_id: str, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).eq("movie_id", movie_id).execute().data)
+
+    def get_titles_by_ids(self, movie_ids, fields=None):
+        movie_ids = list(dict.fromkeys(movie_ids))
+        if not movie_ids:
+            return []
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).in_("movie_id", movie_ids).execute().data)
+
+    def list_titles(self, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).execute().data)
 
-    def list_titles(self):
-        return self.supabase.table(self.table).select("*").execute().data
+    def list_titles_page(self, after=None, limit: int = DEFAULT_PAGE_SIZE, fields=None):
+        rows, cursor = keyset_page(self.supabase.table(self.table).select(columns(self.table, fields, "movie_id")), "movie_id", after, limit)
+        return self._rows(rows), cursor
 
-    def search_titles(self, keyword: str):
-        return self.supabase.table(self.table).select("*").ilike("title", f"%{keyword}%").execute().data
+    def list_titles_range(self, offset: int, limit: int, keyword: str = None, fields=None):
+        query = self.supabase.table(self.table).select(columns(self.table, fields), count="exact")
+        if keyword:
+            query = query.ilike("title", f"%{keyword}%")
+        response = query.order("movie_id").range(offset, offset + limit - 1).execute()
+        return self._rows(response.data), response.count or 0
+
+    def iter_titles(self, page_size: int = DEFAULT_PAGE_SIZE, fields=None):
+        return iter_pages(lambda after, limit: self.list_titles_page(after, limit, fields), page_size)
+
+    def count_titles(self, count: str = "exact"):
+        return self.supabase.table(self.table).select("movie_id", count=count, head=True).execute().count or 0
+
+    def search_titles(self, keyword: str, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).ilike("title", f"%{keyword}%").execute().data)
 
     def update_title(self, movie_id: str, title: str = None, type_: str = None, genre: str = None):
         update_fields = {}
@@ -41,8 +83,60 @@ class TitleDAO:
         genres = [row["genre"] for row in response.data if row.get("genre")]
         return list(set(genres)) 
 
-    def search_movies(self, query):
-        response = supabase.table(self.table).select("*").or_(
+    # Requires a SQL function in the database:
+    #   create function distinct_genres() returns setof text language sql stable
+    #   as $$ select distinct trim(g) from movies_shows,
+    #         unnest(string_to_array(genre, ',')) as g where trim(g) <> '' $$;
+    def list_distinct_genres(self):
+        return [row["distinct_genres"] for row in self.supabase.rpc("distinct_genres").execute().data]
+
+    def search_movies(self, query, fields=None):
+        response = self.supabase.table(self.table).select(columns(self.table, fields)).or_(
             f"title.ilike.%{query}%,genre.ilike.%{query}%"
         ).execute()
-        return response.data
\ No newline at end of file
+        return self._rows(response.data)
+
+
+@instrument
+class AsyncTitleDAO:
+    model = Title
+
+    def __init__(self, models: bool = None):
+        self.table = "movies_shows"
+        self.models = use_models(models)
+
+    def _rows(self, rows):
+        return self.model.from_rows(rows) if self.models else rows
+
+    async def _table(self):
+        return (await get_async_supabase()).table(self.table)
+
+    async def get_title_by_id(self, movie_id: str, fields=None):
+        query = (await self._table()).select(columns(self.table, fields)).eq("movie_id", movie_id)
+        return self._rows((await query.execute()).data)
+
+    async def get_titles_by_ids(self, movie_ids, fields=None):
+        movie_ids = list(dict.fromkeys(movie_ids))
+        if not movie_ids:
+            return []
+        query = (await self._table()).select(columns(self.table, fields)).in_("movie_id", movie_ids)
+        return self._rows((await query.execute()).data)
+
+    async def list_titles(self, fields=None):
+        query = (await self._table()).select(columns(self.table, fields))
+        return self._rows((await query.execute()).data)
+
+    async def list_titles_range(self, offset: int, limit: int, keyword: str = None, fields=None):
+        query = (await self._table()).select(columns(self.table, fields), count="exact")
+        if keyword:
+            query = query.ilike("title", f"%{keyword}%")
+        response = await query.order("movie_id").range(offset, offset + limit - 1).execute()
+        return self._rows(response.data), response.count or 0
+
+    async def count_titles(self, count: str = "exact"):
+        query = (await self._table()).select("movie_id", count=count, head=True)
+        return (await query.execute()).count or 0
+
+    async def search_titles(self, keyword: str, fields=None):
+        query = (await self._table()).select(columns(self.table, fields)).ilike("title", f"%{keyword}%")
+        return self._rows((await query.execute()).data)
@@ -1,9 +1,23 @@
-from config import supabase
+from config import get_async_supabase, get_supabase
+from dao.instrumentation import instrument
+from dao.models import User, use_models
+from dao.projections import columns
+from dao.pagination import DEFAULT_PAGE_SIZE, iter_pages, keyset_page
 
+@instrument
 class UserDAO:
-    def __init__(self):
-        self.supabase = supabase
+    model = User
+
+    def __init__(self, models: bool = None):
         self.table = "users"
+        self.models = use_models(models)
+
+    def _rows(self, rows):
+        return self.model.from_rows(rows) if self.models else rows
+
+    @property
+    def supabase(self):
+        return get_supabase()
 
     def create_user(self, name: str, email: str,password: str):
         return self.supabase.table(self.table).insert({
@@ -12,14 +26,24 @@ class UserDAO:
             "password":password
         }).execute().data
 
-    def get_user_by_id(self, user_id: str):
-        return self.supabase.table(self.table).select("*").eq("user_id", user_id).execute().data
+    def get_user_by_id(self, user_id: str, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).eq("user_id", user_id).execute().data)
+
+    def get_user_by_email(self, email: str, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).eq("email", email).execute().data)
+
+    def list_users(self, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).execute().data)
 
-    def get_user_by_email(self, email: str):
-        return self.supabase.table(self.table).select("*").eq("email", email).execute().data
+    def list_users_page(self, after=None, limit: int = DEFAULT_PAGE_SIZE, fields=None):
+        rows, cursor = keyset_page(self.supabase.table(self.table).select(columns(self.table, fields, "user_id")), "user_id", after, limit)
+        return self._rows(rows), cursor
 
-    def list_users(self):
-        return self.supabase.table(self.table).select("*").execute().data
+    def iter_users(self, page_size: int = DEFAULT_PAGE_SIZE, fields=None):
+        return iter_pages(lambda after, limit: self.list_users_page(after, limit, fields), page_size)
+
+    def count_users(self, count: str = "exact"):
+        return self.supabase.table(self.table).select("user_id", count=count, head=True).execute().count or 0
 
     def update_user(self, user_id: str, name: str = None, email: str = None, password: str = None):
         update_fields = {}
@@ -36,3 +60,41 @@ class UserDAO:
     def delete_user(self, user_id: str):
         return self.supabase.table(self.table).delete().eq("user_id", user_id).execute().data
 
+
+@instrument
+class AsyncUserDAO:
+    model = User
+
+    def __init__(self, models: bool = None):
+        self.table = "users"
+        self.models = use_models(models)
+
+    def _rows(self, rows):
+        return self.model.from_rows(rows) if self.models else rows
+
+    async def _table(self):
+        return (await get_async_supabase()).table(self.table)
+
+    async def create_user(self, name: str, email: str, password: str):
+        query = (await self._table()).insert({
+            "name": name,
+            "email": email,
+            "password": password
+        })
+        return (await query.execute()).data
+
+    async def get_user_by_id(self, user_id: str, fields=None):
+        query = (await self._table()).select(columns(self.table, fields)).eq("user_id", user_id)
+        return self._rows((await query.execute()).data)
+
+    async def get_user_by_email(self, email: str, fields=None):
+        query = (await self._table()).select(columns(self.table, fields)).eq("email", email)
+        return self._rows((await query.execute()).data)
+
+    async def list_users(self, fields=None):
+        query = (await self._table()).select(columns(self.table, fields))
+        return self._rows((await query.execute()).data)
+
+    async def count_users(self, count: str = "exact"):
+        query = (await self._table()).select("user_id", count=count, head=True)
+        return (await query.execute()).count or 0
@@ -1,9 +1,47 @@
-from config import supabase
+import asyncio
 
+from config import get_async_supabase, get_supabase
+from dao.instrumentation import instrument
+from dao.models import Row, WatchlistEntry, use_models
+from dao.projections import columns
+from dao.pagination import DEFAULT_PAGE_SIZE, iter_pages, keyset_page
+
+
+def _title_embed(select: str, inner=None):
+    # Filtering on the embedded title needs an inner join, or PostgREST
+    # keeps non-matching rows with a null embed and the count is wrong.
+    return select.replace("movies_shows(", "movies_shows!inner(") if inner else select
+
+
+def _genre_filter(genres):
+    # genre holds comma-separated lists such as "Action, Drama": ilike finds
+    # candidates in the database and the exact split below drops substrings
+    # like "Action" inside "Action-Adventure".
+    return ",".join(f'genre.ilike."*{genre}*"' for genre in genres)
+
+
+def _has_genre(row, wanted):
+    title = row.get("movies_shows") or {}
+    if "genre" not in title:
+        return True
+    genre = title["genre"] or ""
+    return not wanted.isdisjoint(part.strip().lower() for part in genre.split(","))
+
+
+@instrument
 class WatchlistDAO:
-    def __init__(self):
-        self.supabase = supabase
+    model = WatchlistEntry
+
+    def __init__(self, models: bool = None):
         self.table = "userwatchlist"
+        self.models = use_models(models)
+
+    def _rows(self, rows):
+        return self.model.from_rows(rows) if self.models else rows
+
+    @property
+    def supabase(self):
+        return get_supabase()
 
     def add_to_watchlist(self, user_id: str, movie_id: str, status: str = "planning", rating: int = None, review: str = None):
         return self.supabase.table(self.table).insert({
@@ -14,18 +52,63 @@ class WatchlistDAO:
             "review": review
         }).execute().data
 
-    def get_watchlist_entry(self, watchlist_id: str):
-        return self.supabase.table(self.table).select("*").eq("watchlist_id", watchlist_id).execute().data
+    def add_many(self, entries):
+        if not entries:
+            return []
+        return self.supabase.table(self.table).insert(entries).execute().data
+
+    def get_watchlist_entry(self, watchlist_id: str, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).eq("watchlist_id", watchlist_id).execute().data)
+
+    def get_user_watchlist(self, user_id: str, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).eq("user_id", user_id).execute().data)
+
+    def get_user_watchlist_page(self, user_id: str, after=None, limit: int = DEFAULT_PAGE_SIZE, fields=None):
+        rows, cursor = keyset_page(self.supabase.table(self.table).select(columns(self.table, fields, "watchlist_id")).eq("user_id", user_id), "watchlist_id", after, limit)
+        return self._rows(rows), cursor
+
+    def iter_user_watchlist(self, user_id: str, page_size: int = DEFAULT_PAGE_SIZE, fields=None):
+        return iter_pages(lambda after, limit: self.get_user_watchlist_page(user_id, after, limit, fields), page_size)
 
-    def get_user_watchlist(self, user_id: str):
-        return self.supabase.table(self.table).select("*").eq("user_id", user_id).execute().data
+    def list_watchlist_page(self, after=None, limit: int = DEFAULT_PAGE_SIZE, fields=None):
+        rows, cursor = keyset_page(self.supabase.table(self.table).select(columns(self.table, fields, "watchlist_id")), "watchlist_id", after, limit)
+        return self._rows(rows), cursor
 
-    def get_user_watchlist_by_status(self, user_id: str, status: str):
-        return self.supabase.table(self.table).select("*").eq("user_id", user_id).eq("status", status).execute().data
+    def iter_watchlist(self, page_size: int = DEFAULT_PAGE_SIZE, fields=None, after=None):
+        return iter_pages(lambda after, limit: self.list_watchlist_page(after, limit, fields), page_size, after)
 
-    def get_user_watchlist_by_genre(self, user_id: str, genre: str):
-        return (self.supabase.table(self.table).select("*, movies_shows(title, genre)").eq("user_id", user_id).eq("movies_shows.genre", genre).execute().data)
+    def get_user_watchlist_with_titles(self, user_id: str, fields="with_titles"):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).eq("user_id", user_id).execute().data)
 
+    def get_user_watchlist_with_titles_range(self, user_id: str, offset: int, limit: int, keyword: str = None, fields="with_titles"):
+        query = self.supabase.table(self.table).select(_title_embed(columns(self.table, fields), keyword), count="exact").eq("user_id", user_id)
+        if keyword:
+            query = query.ilike("movies_shows.title", f"%{keyword}%")
+        response = query.order("watchlist_id").range(offset, offset + limit - 1).execute()
+        return self._rows(response.data), response.count or 0
+
+    def get_user_watchlist_by_status(self, user_id: str, status: str, fields=None):
+        return self._rows(self.supabase.table(self.table).select(columns(self.table, fields)).eq("user_id", user_id).eq("status", status).execute().data)
+
+    def get_user_watchlist_by_genre(self, user_id: str, genres, fields="with_titles"):
+        genres = [g.strip() for g in (genres.split(",") if isinstance(genres, str) else genres) if g.strip()]
+        if not genres:
+            return []
+        rows = (
+            self.supabase.table(self.table).select(_title_embed(columns(self.table, fields), True))
+            .eq("user_id", user_id)
+            .or_(_genre_filter(genres), reference_table="movies_shows")
+            .execute().data
+        )
+        wanted = {genre.strip().lower() for genre in genres}
+        return self._rows([row for row in rows if _has_genre(row, wanted)])
+
+
+    def status_counts(self, user_id: str, count: str = "exact"):
+        counts = {}
+        for status in ("watched", "planning", "dropped"):
+            counts[status] = self.supabase.table(self.table).select("watchlist_id", count=count, head=True).eq("user_id", user_id).eq("status", status).execute().count or 0
+        return counts
 
     def update_watchlist_entry(self, watchlist_id: str, status: str = None, rating: int = None, review: str = None):
         update_fields = {}
@@ -44,4 +127,96 @@ class WatchlistDAO:
     def remove_from_watchlist(self, watchlist_id: str):
         return self.supabase.table(self.table).delete().eq("watchlist_id", watchlist_id).execute().data
 
+    def update_many(self, watchlist_ids, status: str = None, rating: int = None, review: str = None):
+        update_fields = {}
+        if status:
+            update_fields["status"] = status
+        if rating is not None:
+            update_fields["rating"] = rating
+        if review:
+            update_fields["review"] = review
+
+        if not update_fields:
+            return {"error": "No fields to update"}
+
+        return self.supabase.table(self.table).update(update_fields).in_("watchlist_id", list(watchlist_ids)).execute().data
+
+    def upsert_many(self, entries):
+        if not entries:
+            return []
+        entries = [entry.to_record() if isinstance(entry, Row) else entry for entry in entries]
+        return self.supabase.table(self.table).upsert(entries, on_conflict="watchlist_id").execute().data
+
+    def remove_many(self, watchlist_ids):
+        watchlist_ids = list(watchlist_ids)
+        if not watchlist_ids:
+            return []
+        return self.supabase.table(self.table).delete().in_("watchlist_id", watchlist_ids).execute().data
+
+
+@instrument
+class AsyncWatchlistDAO:
+    model = WatchlistEntry
+
+    def __init__(self, models: bool = None):
+        self.table = "userwatchlist"
+        self.models = use_models(models)
+
+    def _rows(self, rows):
+        return self.model.from_rows(rows) if self.models else rows
+
+    async def _table(self):
+        return (await get_async_supabase()).table(self.table)
+
+    async def add_to_watchlist(self, user_id: str, movie_id: str, status: str = "planning", rating: int = None, review: str = None):
+        query = (await self._table()).insert({
+            "user_id": user_id,
+            "movie_id": movie_id,
+            "status": status,
+            "rating": rating,
+            "review": review
+        })
+        return (await query.execute()).data
+
+    async def get_user_watchlist(self, user_id: str, fields=None):
+        query = (await self._table()).select(columns(self.table, fields)).eq("user_id", user_id)
+        return self._rows((await query.execute()).data)
+
+    async def get_user_watchlist_with_titles(self, user_id: str, fields="with_titles"):
+        query = (await self._table()).select(columns(self.table, fields)).eq("user_id", user_id)
+        return self._rows((await query.execute()).data)
+
+    async def get_user_watchlist_with_titles_range(self, user_id: str, offset: int, limit: int, keyword: str = None, fields="with_titles"):
+        query = (await self._table()).select(_title_embed(columns(self.table, fields), keyword), count="exact").eq("user_id", user_id)
+        if keyword:
+            query = query.ilike("movies_shows.title", f"%{keyword}%")
+        response = await query.order("watchlist_id").range(offset, offset + limit - 1).execute()
+        return self._rows(response.data), response.count or 0
+
+    async def status_counts(self, user_id: str, count: str = "exact"):
+        statuses = ("watched", "planning", "dropped")
+        client = await get_async_supabase()
+        responses = await asyncio.gather(*(
+            client.table(self.table).select("watchlist_id", count=count, head=True).eq("user_id", user_id).eq("status", status).execute()
+            for status in statuses
+        ))
+        return {status: response.count or 0 for status, response in zip(statuses, responses)}
+
+    async def update_watchlist_entry(self, watchlist_id: str, status: str = None, rating: int = None, review: str = None):
+        update_fields = {}
+        if status:
+            update_fields["status"] = status
+        if rating is not None:
+            update_fields["rating"] = rating
+        if review:
+            update_fields["review"] = review
+
+        if not update_fields:
+            return {"error": "No fields to update"}
+
+        query = (await self._table()).update(update_fields).eq("watchlist_id", watchlist_id)
+        return (await query.execute()).data
 
+    async def remove_from_watchlist(self, watchlist_id: str):
+        query = (await self._table()).delete().eq("watchlist_id", watchlist_id)
+        return (await query.execute()).data
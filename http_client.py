@@ -0,0 +1,246 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+
+import httpx
+
+# Reads are safe to repeat; a write is only retried when the connection was
+# never established, so the server cannot have seen it.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout)
+
+_transports = weakref.WeakSet()
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@dataclass(frozen=True)
+class HTTPSettings:
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 15.0
+    write_timeout: float = 15.0
+    pool_timeout: float = 5.0
+    http2: bool = False
+    # Retries sleep on the calling thread, which for the app is a Streamlit
+    # script run, so a failing read can stall a page by up to
+    # retries * backoff_max on top of its timeouts (2 s by default). Keep
+    # backoff_max well below read_timeout.
+    retries: int = 2
+    backoff: float = 0.2
+    backoff_max: float = 1.0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_connections=_env_int("HTTP_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive=_env_int("HTTP_MAX_KEEPALIVE", cls.max_keepalive),
+            keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            connect_timeout=_env_float("HTTP_CONNECT_TIMEOUT", cls.connect_timeout),
+            read_timeout=_env_float("HTTP_READ_TIMEOUT", cls.read_timeout),
+            write_timeout=_env_float("HTTP_WRITE_TIMEOUT", cls.write_timeout),
+            pool_timeout=_env_float("HTTP_POOL_TIMEOUT", cls.pool_timeout),
+            http2=os.getenv("HTTP2", "").lower() in ("1", "true", "yes"),
+            retries=_env_int("HTTP_RETRIES", cls.retries),
+            backoff=_env_float("HTTP_BACKOFF", cls.backoff),
+            backoff_max=_env_float("HTTP_BACKOFF_MAX", cls.backoff_max),
+        )
+
+    def limits(self):
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self):
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+class TransportStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def start(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, error: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self.errors += error
+
+    def retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+            }
+
+
+class _RetryMixin:
+    # Retry policy shared by the sync and async transports. Delays use full
+    # jitter so sessions that failed together do not retry together; a
+    # Retry-After header wins when sent, still capped at backoff_max.
+
+    def _setup(self, name: str, settings: HTTPSettings):
+        self.name = name
+        self.settings = settings
+        self.stats = TransportStats()
+        _transports.add(self)
+
+    def _should_retry(self, request, attempt: int, response=None, error=None):
+        if attempt >= self.settings.retries:
+            return False
+        if error is not None:
+            if isinstance(error, NOT_SENT):
+                return True
+            # PoolTimeout means every connection is busy; retrying only
+            # adds to the queue.
+            return request.method in IDEMPOTENT_METHODS and not isinstance(error, httpx.PoolTimeout)
+        return request.method in IDEMPOTENT_METHODS and response.status_code in RETRY_STATUSES
+
+    def _delay(self, attempt: int, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.settings.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.settings.backoff_max, self.settings.backoff * 2 ** attempt))
+
+    def pool_state(self):
+        # httpcore does not publish pool state; read it best-effort so a
+        # library upgrade degrades to zeros instead of failing the app.
+        pool = getattr(self._transport, "_pool", None)
+        connections = getattr(pool, "connections", [])
+        requests = getattr(pool, "_requests", [])
+        queued = sum(1 for request in requests if request.is_queued())
+        return {
+            "connections": len(connections),
+            "idle": sum(1 for connection in connections if connection.is_idle()),
+            "active_requests": len(requests) - queued,
+            "queued_requests": queued,
+            "max_connections": self.settings.max_connections,
+        }
+
+    def metrics(self):
+        return {"client": self.name, **self.pool_state(), **self.stats.to_dict()}
+
+
+class RetryTransport(_RetryMixin, httpx.BaseTransport):
+    def __init__(self, settings: HTTPSettings, name: str = "sync"):
+        self._setup(name, settings)
+        self._transport = httpx.HTTPTransport(limits=settings.limits(), http2=settings.http2)
+
+    def handle_request(self, request):
+        attempt = 0
+        while True:
+            self.stats.start()
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as error:
+                self.stats.finish(True)
+                if not self._should_retry(request, attempt, error=error):
+                    raise
+                delay = self._delay(attempt)
+            else:
+                self.stats.finish(response.status_code >= 500)
+                if not self._should_retry(request, attempt, response=response):
+                    return response
+                delay = self._delay(attempt, response)
+                # Drain the error body so the connection goes back to the pool.
+                response.read()
+                response.close()
+            self.stats.retry()
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncRetryTransport(_RetryMixin, httpx.AsyncBaseTransport):
+    def __init__(self, settings: HTTPSettings, name: str = "async"):
+        self._setup(name, settings)
+        self._transport = httpx.AsyncHTTPTransport(limits=settings.limits(), http2=settings.http2)
+
+    async def handle_async_request(self, request):
+        attempt = 0
+        while True:
+            self.stats.start()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as error:
+                self.stats.finish(True)
+                if not self._should_retry(request, attempt, error=error):
+                    raise
+                delay = self._delay(attempt)
+            else:
+                self.stats.finish(response.status_code >= 500)
+                if not self._should_retry(request, attempt, response=response):
+                    return response
+                delay = self._delay(attempt, response)
+                await response.aread()
+                await response.aclose()
+            self.stats.retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def create_http_client(settings: HTTPSettings = None, **kwargs):
+    # Settings default to the HTTP_* environment variables; extra kwargs
+    # (e.g. base_url, headers) go to httpx.Client.
+    settings = settings or HTTPSettings.from_env()
+    return httpx.Client(
+        transport=RetryTransport(settings), timeout=settings.timeout(), follow_redirects=True, **kwargs
+    )
+
+
+def create_async_http_client(settings: HTTPSettings = None, **kwargs):
+    settings = settings or HTTPSettings.from_env()
+    return httpx.AsyncClient(
+        transport=AsyncRetryTransport(settings), timeout=settings.timeout(), follow_redirects=True, **kwargs
+    )
+
+
+def pool_metrics():
+    # Counters and pool occupancy for every live client built here.
+    return [transport.metrics() for transport in list(_transports)]
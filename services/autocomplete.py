@@ -0,0 +1,93 @@
+import bisect
+import threading
+
+from services.search_index import tokenize
+
+
+def normalize(title):
+    return " ".join(tokenize(title))
+
+
+class TitleAutocomplete:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._rows = {}
+            # Sorted (key, movie_id) pairs: one for the whole normalized
+            # title, and one per later word so "knight" finds "The Dark Knight".
+            self._titles = []
+            self._words = []
+            self.built = False
+
+    def build(self, rows):
+        with self._lock:
+            self.clear()
+            titles, words = [], []
+            for row in rows:
+                movie_id = row.get("movie_id")
+                if movie_id is None:
+                    continue
+                self._rows[movie_id] = row
+                title_key, word_keys = self._keys(row)
+                titles.append((title_key, movie_id))
+                words.extend((key, movie_id) for key in word_keys)
+            self._titles = sorted(titles)
+            self._words = sorted(words)
+            self.built = True
+
+    def add(self, row):
+        movie_id = row.get("movie_id")
+        if movie_id is None:
+            return
+        with self._lock:
+            self.remove(movie_id)
+            self._rows[movie_id] = row
+            title_key, word_keys = self._keys(row)
+            bisect.insort(self._titles, (title_key, movie_id))
+            for key in word_keys:
+                bisect.insort(self._words, (key, movie_id))
+
+    def update(self, row):
+        self.add(row)
+
+    def remove(self, movie_id):
+        with self._lock:
+            row = self._rows.pop(movie_id, None)
+            if row is None:
+                return
+            title_key, word_keys = self._keys(row)
+            self._discard(self._titles, (title_key, movie_id))
+            for key in word_keys:
+                self._discard(self._words, (key, movie_id))
+
+    def complete(self, prefix: str, limit: int = 10):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            seen = []
+            for entries in (self._titles, self._words):
+                index = bisect.bisect_left(entries, (prefix,))
+                while index < len(entries) and len(seen) < limit:
+                    key, movie_id = entries[index]
+                    if not key.startswith(prefix):
+                        break
+                    if movie_id not in seen:
+                        seen.append(movie_id)
+                    index += 1
+            return [self._rows[movie_id] for movie_id in seen]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _keys(self, row):
+        words = tokenize(row.get("title"))
+        return " ".join(words), [" ".join(words[i:]) for i in range(1, len(words))]
+
+    def _discard(self, entries, entry):
+        index = bisect.bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
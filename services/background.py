@@ -0,0 +1,50 @@
+import threading
+import weakref
+
+_jobs = weakref.WeakKeyDictionary()
+_jobs_lock = threading.Lock()
+
+
+class BackgroundJob:
+    # Runs a refresh on a daemon thread, at most one run at a time, while
+    # readers keep what the structure held before. The last failure stays in
+    # error until a run succeeds.
+
+    def __init__(self, name: str):
+        self.name = name
+        self.error = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, target) -> bool:
+        with self._lock:
+            if self.running():
+                return False
+            self._thread = threading.Thread(target=self._run, args=(target,), name=self.name, daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: float = None):
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self, target):
+        try:
+            target()
+        except Exception as e:
+            self.error = e
+        else:
+            self.error = None
+
+
+def job_for(owner, name: str) -> BackgroundJob:
+    # One job per shared structure for the whole process.
+    with _jobs_lock:
+        job = _jobs.get(owner)
+        if job is None:
+            job = _jobs[owner] = BackgroundJob(name)
+        return job
@@ -0,0 +1,78 @@
+import threading
+from collections import Counter, defaultdict
+
+
+def split_genres(genre):
+    if not genre:
+        return ()
+    return tuple(dict.fromkeys(part.strip() for part in genre.split(",") if part.strip()))
+
+
+class GenreRegistry:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._counts = Counter()
+            self._by_title = {}
+            self._titles = defaultdict(set)
+            self.built = False
+
+    def build(self, rows):
+        with self._lock:
+            self.clear()
+            for row in rows:
+                self.add(row)
+            self.built = True
+
+    def add(self, row):
+        movie_id = row.get("movie_id")
+        if movie_id is None:
+            return
+        with self._lock:
+            self.remove(movie_id)
+            genres = split_genres(row.get("genre"))
+            self._by_title[movie_id] = genres
+            self._counts.update(genres)
+            for genre in genres:
+                self._titles[genre.lower()].add(movie_id)
+
+    def update(self, row):
+        self.add(row)
+
+    def remove(self, movie_id):
+        with self._lock:
+            genres = self._by_title.pop(movie_id, ())
+            self._counts.subtract(genres)
+            for genre in genres:
+                if self._counts[genre] <= 0:
+                    del self._counts[genre]
+                titles = self._titles.get(genre.lower())
+                if titles is not None:
+                    titles.discard(movie_id)
+                    if not titles:
+                        del self._titles[genre.lower()]
+
+    def genres(self):
+        with self._lock:
+            return sorted(self._counts)
+
+    def counts(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def movie_ids(self, genres):
+        # Titles tagged with any of the genres; a string may list several, comma-separated.
+        if isinstance(genres, str):
+            genres = split_genres(genres)
+        with self._lock:
+            found = set()
+            for genre in genres:
+                found |= self._titles.get(genre.strip().lower(), set())
+            return found
+
+    def count(self, genre: str):
+        with self._lock:
+            return self._counts.get(genre.strip(), 0)
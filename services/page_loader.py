@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from dao.instrumentation import current_request
+
+DEFAULT_TIMEOUT = 5.0
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def background_loop():
+    # Streamlit scripts run synchronously on their own threads, so every
+    # page shares one long-lived loop and its async Supabase connections.
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="page-loader", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run(coro, timeout: float = None):
+    return asyncio.run_coroutine_threadsafe(coro, background_loop()).result(timeout)
+
+
+class PageLoader:
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT):
+        self.timeout = timeout
+
+    async def gather(self, queries: dict, request_id: str = None):
+        # Tasks copy the context they are created in, so binding the
+        # caller's request here tags every query's DAO metrics with it.
+        if request_id is not None:
+            current_request.set(request_id)
+        names = list(queries)
+        awaitables = []
+        for name in names:
+            query = queries[name]
+            coro, timeout = query if isinstance(query, tuple) else (query, self.timeout)
+            awaitables.append(asyncio.wait_for(coro, timeout))
+        results = await asyncio.gather(*awaitables, return_exceptions=True)
+
+        data, errors = {}, {}
+        for name, result in zip(names, results):
+            if isinstance(result, asyncio.TimeoutError):
+                errors[name] = "Timed out."
+            elif isinstance(result, Exception):
+                errors[name] = str(result) or type(result).__name__
+            else:
+                data[name] = result
+        return data, errors
+
+    def load(self, queries: dict):
+        # queries maps a name to a coroutine, or to (coroutine, timeout).
+        # Returns (data, errors); a failed or timed-out query only lands in
+        # errors, so the rest of the page can still render.
+        return run(self.gather(queries, current_request.get()))
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import numpy as np
+
+# How much an entry says about a user's taste. Ratings scale the weight
+# between 0.6x (1/10) and 1.5x (10/10); unrated entries keep the base.
+STATUS_WEIGHTS = {"watched": 1.0, "planning": 0.5, "dropped": 0.1}
+NEIGHBORS = 50
+# Only a user's highest-weighted titles count towards co-occurrence, so a
+# handful of huge watchlists cannot make the build quadratic.
+MAX_USER_TITLES = 300
+# Upper bound on (title, user, title) triples expanded per batch.
+BATCH_PAIRS = 4_000_000
+POPULAR = 200
+
+
+def _ranges(lengths):
+    # Concatenated aranges: [3, 2] -> [0, 1, 2, 0, 1].
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum())) - np.repeat(offsets, lengths)
+
+
+def entry_weights(statuses, status, rating):
+    base = np.array([STATUS_WEIGHTS.get(value, 0.0) for value in statuses], np.float64)[status]
+    return np.where(rating > 0, base * (0.5 + rating / 10.0), base)
+
+
+class ItemNeighbors:
+    # Top-k title neighbours by cosine similarity of weighted user×title
+    # columns. The matrix is held sorted by user and by title; a batch of
+    # titles expands to their users and then to those users' other titles,
+    # and one bincount sums the batch's co-occurrence weights. Neighbours are
+    # kept by movie_id so they survive snapshot rebuilds.
+
+    def __init__(self, neighbors: int = NEIGHBORS):
+        self.k = neighbors
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.movie_ids = np.empty(0, np.int64)
+            self.neighbors = np.empty((0, self.k), np.int64)
+            self.similarities = np.empty((0, self.k), np.float32)
+            self.popular = np.empty(0, np.int64)
+            self.built_at = 0.0
+            self.built = False
+
+    def age(self):
+        return time.monotonic() - self.built_at
+
+    def build(self, snapshot):
+        user, title, status, rating = snapshot.entries()
+        movie_ids = np.array(snapshot.titles.values, np.int64)
+        weights = entry_weights(snapshot.statuses.values, status, rating)
+        keep = weights > 0
+        user, title, weights = user[keep], title[keep], weights[keep]
+        n_users, n_titles = len(snapshot.users), len(movie_ids)
+
+        by_user = np.lexsort((-weights, user))
+        user, title, weights = user[by_user], title[by_user], weights[by_user]
+        counts = np.bincount(user, minlength=n_users)
+        keep = _ranges(counts) < MAX_USER_TITLES
+        user, title, weights = user[keep], title[keep], weights[keep]
+        user_counts = np.bincount(user, minlength=n_users)
+        user_starts = np.cumsum(user_counts) - user_counts
+
+        by_title = np.argsort(title, kind="stable")
+        title_users, title_weights = user[by_title], weights[by_title]
+        title_counts = np.bincount(title, minlength=n_titles)
+        title_starts = np.cumsum(title_counts) - title_counts
+        norms = np.sqrt(np.bincount(title, weights=weights ** 2, minlength=n_titles))
+        cost = np.bincount(title, weights=user_counts[user], minlength=n_titles)
+
+        k = min(self.k, max(n_titles - 1, 0))
+        neighbors = np.full((n_titles, self.k), -1, np.int64)
+        similarities = np.zeros((n_titles, self.k), np.float32)
+        start = 0
+        while start < n_titles and k:
+            # Grow the batch until it would expand too many triples or its
+            # dense score block would outgrow the same budget.
+            cumulative = np.cumsum(cost[start:])
+            stop = start + max(1, int(np.searchsorted(cumulative, BATCH_PAIRS)))
+            stop = min(stop, start + max(1, BATCH_PAIRS // n_titles), n_titles)
+            items = np.arange(start, stop)
+
+            lengths = title_counts[items]
+            rows = np.repeat(np.arange(len(items)), lengths)
+            index = np.repeat(title_starts[items], lengths) + _ranges(lengths)
+            users, item_weights = title_users[index], title_weights[index]
+
+            lengths = user_counts[users]
+            index = np.repeat(user_starts[users], lengths) + _ranges(lengths)
+            scores = np.bincount(
+                np.repeat(rows, lengths) * n_titles + title[index],
+                weights=np.repeat(item_weights, lengths) * weights[index],
+                minlength=len(items) * n_titles,
+            ).reshape(len(items), n_titles)
+            scores[np.arange(len(items)), items] = 0
+            with np.errstate(invalid="ignore", divide="ignore"):
+                scores = np.nan_to_num(scores / np.outer(norms[items], norms))
+
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top, top_scores = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+            neighbors[items, :k] = np.where(top_scores > 0, movie_ids[top], -1)
+            similarities[items, :k] = np.where(top_scores > 0, top_scores, 0)
+            start = stop
+
+        popularity = np.bincount(title, weights=weights, minlength=n_titles)
+        by_movie = np.argsort(movie_ids)
+        with self._lock:
+            self.movie_ids = movie_ids[by_movie]
+            self.neighbors = neighbors[by_movie]
+            self.similarities = similarities[by_movie]
+            self.popular = movie_ids[np.argsort(-popularity, kind="stable")[:POPULAR]]
+            self.built_at = time.monotonic()
+            self.built = True
+
+    def similar(self, movie_id, k: int = 10):
+        with self._lock:
+            position = self._positions(np.array([movie_id]))[0]
+            if position < 0:
+                return []
+            found = self.neighbors[position] >= 0
+            return list(zip(self.neighbors[position][found][:k].tolist(), self.similarities[position][found][:k].tolist()))
+
+    def recommend(self, movie_ids, weights, k: int = 10):
+        # (movie_id, score) pairs, scored by summed similarity to movie_ids.
+        with self._lock:
+            positions = self._positions(np.asarray(movie_ids, np.int64))
+            known = positions >= 0
+            neighbors = self.neighbors[positions[known]]
+            scores = self.similarities[positions[known]] * np.asarray(weights)[known, None]
+            found = neighbors >= 0
+            candidates, inverse = np.unique(neighbors[found], return_inverse=True)
+            totals = np.bincount(inverse, weights=scores[found], minlength=len(candidates))
+            fresh = ~np.isin(candidates, movie_ids)
+            candidates, totals = candidates[fresh], totals[fresh]
+            order = np.argsort(-totals, kind="stable")[:k]
+            picks = list(zip(candidates[order].tolist(), totals[order].tolist()))
+            if len(picks) < k:
+                seen = set(np.asarray(movie_ids).tolist()) | {movie_id for movie_id, _ in picks}
+                picks += [(movie_id, 0.0) for movie_id in self.popular.tolist() if movie_id not in seen][:k - len(picks)]
+            return picks
+
+    def _positions(self, movie_ids):
+        positions = np.searchsorted(self.movie_ids, movie_ids)
+        positions = np.minimum(positions, max(len(self.movie_ids) - 1, 0))
+        if not len(self.movie_ids):
+            return np.full(len(movie_ids), -1)
+        return np.where(self.movie_ids[positions] == movie_ids, positions, -1)
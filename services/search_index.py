@@ -0,0 +1,160 @@
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+TITLE_WEIGHT = 2.0
+GENRE_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.5
+FUZZY_MIN_SIMILARITY = 0.4
+FUZZY_MAX_EXPANSIONS = 5
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def trigrams(token: str):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleSearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._docs = {}
+            self._normalized = {}
+            self._postings = defaultdict(dict)
+            self._trigrams = defaultdict(set)
+            self.built = False
+
+    def build(self, rows):
+        with self._lock:
+            self.clear()
+            for row in rows:
+                self.add(row)
+            self.built = True
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, row):
+        movie_id = row.get("movie_id")
+        if movie_id is None:
+            return
+        with self._lock:
+            if movie_id in self._docs:
+                self.remove(movie_id)
+            self._docs[movie_id] = row
+            self._normalized[movie_id] = " ".join(tokenize(row.get("title")))
+            for token, weight in self._field_weights(row).items():
+                postings = self._postings[token]
+                if not postings:
+                    for gram in trigrams(token):
+                        self._trigrams[gram].add(token)
+                postings[movie_id] = weight
+
+    def update(self, row):
+        self.add(row)
+
+    def get(self, movie_id):
+        return self._docs.get(movie_id)
+
+    def remove(self, movie_id):
+        with self._lock:
+            row = self._docs.pop(movie_id, None)
+            if row is None:
+                return
+            del self._normalized[movie_id]
+            for token in self._field_weights(row):
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(movie_id, None)
+                if not postings:
+                    del self._postings[token]
+                    for gram in trigrams(token):
+                        self._trigrams[gram].discard(token)
+                        if not self._trigrams[gram]:
+                            del self._trigrams[gram]
+
+    def search(self, query: str, limit: int = 20):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            total = len(self._docs) or 1
+            scores = defaultdict(float)
+            for position, token in enumerate(tokens):
+                last = position == len(tokens) - 1
+                for term, boost in self._expand(token, last):
+                    postings = self._postings[term]
+                    idf = math.log(1 + total / len(postings))
+                    for movie_id, weight in postings.items():
+                        scores[movie_id] += weight * idf * boost
+            phrase = " ".join(tokens)
+            best = heapq.nlargest(
+                limit,
+                scores.items(),
+                key=lambda item: (item[1] + self._phrase_bonus(item[0], phrase), item[0]),
+            )
+            return [self._docs[movie_id] for movie_id, _ in best]
+
+    def _expand(self, token: str, last: bool):
+        found = False
+        if token in self._postings:
+            found = True
+            yield token, 1.0
+        # The last query token may still be being typed, so also match
+        # vocabulary that starts with it.
+        if last:
+            for term in self._vocabulary_with_prefix(token):
+                found = True
+                yield term, PREFIX_WEIGHT
+        if not found:
+            yield from self._fuzzy(token)
+
+    def _vocabulary_with_prefix(self, prefix: str):
+        if len(prefix) < 2:
+            return []
+        padded = f"  {prefix}"
+        grams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        candidates = set.intersection(*(self._trigrams.get(gram, set()) for gram in grams))
+        return [term for term in candidates if term != prefix and term.startswith(prefix)]
+
+    def _fuzzy(self, token: str):
+        grams = trigrams(token)
+        overlap = defaultdict(int)
+        for gram in grams:
+            for term in self._trigrams.get(gram, ()):
+                overlap[term] += 1
+        matches = []
+        for term, shared in overlap.items():
+            similarity = shared / (len(grams) + len(trigrams(term)) - shared)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                matches.append((similarity, term))
+        for similarity, term in heapq.nlargest(FUZZY_MAX_EXPANSIONS, matches):
+            yield term, similarity
+
+    def _phrase_bonus(self, movie_id, phrase: str):
+        title = self._normalized[movie_id]
+        if title == phrase:
+            return 10.0
+        if title.startswith(phrase):
+            return 5.0
+        return 0.0
+
+    def _field_weights(self, row):
+        weights = {}
+        for token in tokenize(row.get("genre")):
+            weights[token] = GENRE_WEIGHT
+        for token in tokenize(row.get("title")):
+            weights[token] = weights.get(token, 0.0) + TITLE_WEIGHT
+        return weights
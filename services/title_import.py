@@ -0,0 +1,109 @@
+import csv
+import json
+import os
+import time
+from itertools import islice
+
+from services.genre_registry import split_genres
+
+VALID_TYPES = {"movie", "show", "anime"}
+DEFAULT_CHUNK_SIZE = 500
+
+
+def read_records(path: str):
+    # Yields (line number, record, error). A line that does not parse comes
+    # back as raw text with an error, to be rejected instead of stopping.
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line), None
+                except ValueError as e:
+                    yield number, line.rstrip("\n"), f"Invalid JSON: {e}"
+        else:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record, None
+
+
+def normalize_record(record):
+    if not isinstance(record, dict):
+        return None, "Record is not an object."
+    title, type_, genre = record.get("title"), record.get("type"), record.get("genre")
+    if any(value is not None and not isinstance(value, str) for value in (title, type_, genre)):
+        return None, "Title, type and genre must be text."
+    title = (title or "").strip()
+    if not title:
+        return None, "Missing title."
+    type_ = (type_ or "").strip().lower()
+    if type_ not in VALID_TYPES:
+        return None, "Invalid type. Must be 'Movie', 'Show', or 'Anime'."
+    genre = ", ".join(split_genres(genre)) or None
+    return {"title": title, "type": type_, "genre": genre}, None
+
+
+class TitleImporter:
+    def __init__(self, title_service, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.title_service = title_service
+        self.chunk_size = chunk_size
+
+    def run(self, path: str, rejects_path: str = None, checkpoint_path: str = None, progress=None):
+        rejects_path = rejects_path or f"{path}.rejects.jsonl"
+        checkpoint_path = checkpoint_path or f"{path}.checkpoint.json"
+        done = self._load_checkpoint(checkpoint_path, path)
+        stats = {"read": 0, "inserted": 0, "rejected": 0, "skipped": done}
+
+        records = islice(read_records(path), done, None)
+        started = time.perf_counter()
+        # A fresh run starts a new rejects file; a resumed one appends to it.
+        with open(rejects_path, "a" if done else "w", encoding="utf-8") as rejects:
+            while True:
+                batch = list(islice(records, self.chunk_size))
+                if not batch:
+                    break
+                rows, rejected = [], []
+                for line, record, error in batch:
+                    row, error = (None, error) if error else normalize_record(record)
+                    if error:
+                        rejected.append({"line": line, "record": record, "error": error})
+                    else:
+                        rows.append(row)
+                if rows:
+                    res = self.title_service.add_titles(rows)
+                    if isinstance(res, dict) and "error" in res:
+                        raise RuntimeError(res["error"])
+                    stats["inserted"] += len(rows)
+                # Rejects are written only once their chunk is committed so a
+                # resumed run does not record them twice.
+                for entry in rejected:
+                    rejects.write(json.dumps(entry) + "\n")
+                stats["rejected"] += len(rejected)
+                stats["read"] += len(batch)
+                rejects.flush()
+                self._save_checkpoint(checkpoint_path, path, done + stats["read"])
+                if progress:
+                    progress(self._with_rate(stats, started))
+
+        # An empty or header-only file never saves a checkpoint.
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        return self._with_rate(stats, started)
+
+    def _with_rate(self, stats, started):
+        elapsed = time.perf_counter() - started
+        return {**stats, "seconds": elapsed, "rows_per_second": stats["read"] / elapsed if elapsed else 0.0}
+
+    def _load_checkpoint(self, checkpoint_path: str, path: str):
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        return checkpoint["records_done"] if checkpoint.get("source") == os.path.abspath(path) else 0
+
+    def _save_checkpoint(self, checkpoint_path: str, path: str, records_done: int):
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.abspath(path), "records_done": records_done}, f)
+        os.replace(tmp_path, checkpoint_path)
@@ -1,33 +1,149 @@
-from dao.title_dao import TitleDAO
+from dao.cached_title_dao import TTLS, CachedTitleDAO, title_cache
+from dao.title_dao import AsyncTitleDAO
+from dao.pagination import DEFAULT_PAGE_SIZE
+from services.autocomplete import TitleAutocomplete
+from services.genre_registry import GenreRegistry
+from services.search_index import TitleSearchIndex
+from services.watchlist_store import watchlist_versions
+
+# Shared by every TitleService in the process so writes through one
+# instance are visible to searches through the others.
+title_index = TitleSearchIndex()
+title_autocomplete = TitleAutocomplete()
+genre_registry = GenreRegistry()
 
 class TitleService:
-    def __init__(self):
-        self.dao = TitleDAO()
+    def __init__(self, search_index: TitleSearchIndex = None, autocomplete_index: TitleAutocomplete = None, genres: GenreRegistry = None, models: bool = None):
+        self.dao = CachedTitleDAO(models=models)
+        self.search_index = title_index if search_index is None else search_index
+        self.autocomplete_index = title_autocomplete if autocomplete_index is None else autocomplete_index
+        self.genre_registry = genre_registry if genres is None else genres
 
     def add_title(self, title: str, type_: str,genre =None):
         if type_.lower() not in ["movie", "show", "anime"]:
             return {"error": "Invalid type. Must be 'Movie', 'Show', or 'Anime'."}
-        return self.dao.add_title(title, type_.lower())
+        rows = self.dao.add_title(title, type_.lower(), genre)
+        self._index_rows(rows)
+        return rows
+
+    def add_titles(self, rows):
+        rows = self.dao.add_titles(rows)
+        self._index_rows(rows)
+        return rows
+
+    def list_all_titles(self, fields=None):
+        return self.dao.list_titles(fields)
+
+    def list_titles_page(self, after=None, limit: int = DEFAULT_PAGE_SIZE, fields=None):
+        return self.dao.list_titles_page(after, limit, fields)
+
+    def list_titles_range(self, offset: int, limit: int, keyword: str = None, fields=None):
+        return self.dao.list_titles_range(offset, limit, keyword, fields)
+
+    def iter_titles(self, page_size: int = DEFAULT_PAGE_SIZE, fields=None):
+        return self.dao.iter_titles(page_size, fields)
 
-    def list_all_titles(self):
-        return self.dao.list_titles()
+    def count_titles(self, count: str = "exact"):
+        return self.dao.count_titles(count)
 
-    def search_titles(self, keyword: str):
-        return self.dao.search_titles(keyword)
+    def search_titles(self, keyword: str, fields=None):
+        return self.dao.search_titles(keyword, fields)
 
     def delete_title(self, movie_id: str):
-        return self.dao.delete_title(movie_id)
+        rows = self.dao.delete_title(movie_id)
+        if isinstance(rows, list):
+            for index in (self.search_index, self.autocomplete_index, self.genre_registry):
+                if index.built:
+                    index.remove(movie_id)
+            # The delete cascades to watchlist entries of unknown users, so
+            # every session's watchlist store reloads.
+            if rows:
+                watchlist_versions.bump_all()
+        return rows
     
-    def list_genres(self):
-        return self.dao.list_genres()
+    def list_genres(self, use_database: bool = False):
+        # Each process only sees its own writes; use_database asks the
+        # database instead when several processes write titles.
+        if use_database:
+            return self.dao.list_distinct_genres()
+        return self._genres().genres()
+
+    def genre_counts(self):
+        return self._genres().counts()
+
+    def _genres(self):
+        if not self.genre_registry.built:
+            self.genre_registry.build(self.dao.iter_titles(fields="genre"))
+        return self.genre_registry
+
+    def search_movies(self, query, limit: int = 50, use_index: bool = True):
+        if not use_index:
+            return self.dao.search_movies(query, "search")
+        if not self.search_index.built:
+            self.rebuild_search_index()
+        return self.search_index.search(query, limit)
+
+    def rebuild_search_index(self):
+        self.search_index.build(self.dao.iter_titles(fields="search"))
+
+    def autocomplete(self, prefix: str, limit: int = 10):
+        if not self.autocomplete_index.built:
+            self.rebuild_autocomplete_index()
+        return self.autocomplete_index.complete(prefix, limit)
 
-    def search_movies(self, query):
-        return self.dao.search_movies(query)
+    def rebuild_autocomplete_index(self):
+        self.autocomplete_index.build(self.dao.iter_titles(fields="search"))
     
     def update_title(self, movie_id: str, title: str = None, type_: str = None, genre: str = None):
         if type_ and type_.lower() not in ["Movie", "Show", "Anime"]:
             return {"error": "Invalid type provided."}
-        return self.dao.update_title(movie_id, title, type_, genre)
+        rows = self.dao.update_title(movie_id, title, type_, genre)
+        self._index_rows(rows)
+        return rows
     
-    def get_title(self,movie_id):
-        return self.dao.get_title_by_id(movie_id)
\ No newline at end of file
+    def get_title(self,movie_id, fields=None):
+        return self.dao.get_title_by_id(movie_id, fields)
+
+    def get_titles(self, movie_ids, fields=None):
+        return self.dao.get_titles_by_ids(movie_ids, fields)
+
+    def cache_stats(self):
+        return self.dao.cache_stats()
+
+    def _index_rows(self, rows):
+        if not isinstance(rows, list):
+            return
+        for index in (self.search_index, self.autocomplete_index, self.genre_registry):
+            if index.built:
+                for row in rows:
+                    index.update(row)
+
+
+class AsyncTitleService:
+    def __init__(self, models: bool = None):
+        self.dao = AsyncTitleDAO(models)
+
+    async def list_all_titles(self, fields=None):
+        return await self.dao.list_titles(fields)
+
+    async def list_titles_range(self, offset: int, limit: int, keyword: str = None, fields=None):
+        return await self.dao.list_titles_range(offset, limit, keyword, fields)
+
+    async def count_titles(self, count: str = "exact"):
+        # Same cache entry as CachedTitleDAO.count_titles, so title writes
+        # made through the sync service invalidate it.
+        key = ("count_titles", count)
+        total = title_cache.get(key)
+        if total is None:
+            total = await self.dao.count_titles(count)
+            title_cache.set(key, total, TTLS["count_titles"])
+        return total
+
+    async def search_titles(self, keyword: str, fields=None):
+        return await self.dao.search_titles(keyword, fields)
+
+    async def get_title(self, movie_id, fields=None):
+        return await self.dao.get_title_by_id(movie_id, fields)
+
+    async def get_titles(self, movie_ids, fields=None):
+        return await self.dao.get_titles_by_ids(movie_ids, fields)
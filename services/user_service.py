@@ -1,25 +1,35 @@
-from dao.user_dao import UserDAO
+from dao.user_dao import AsyncUserDAO, UserDAO
+from dao.pagination import DEFAULT_PAGE_SIZE
 import hashlib
 
 class UserService:
-    def __init__(self):
-        self.dao = UserDAO()
+    def __init__(self, models: bool = None):
+        self.dao = UserDAO(models)
 
-    def create_user(self, name: str, email: str):
-        existing = self.dao.get_user_by_email(email)
+    def create_user(self, name: str, email: str, password: str = None):
+        existing = self.dao.get_user_by_email(email, "id")
         if existing:
             return {"error": "Email already exists."}
-        return self.dao.create_user(name, email)
+        return self._without_password(self.dao.create_user(name, email, self.hash_password(password) if password else None))
 
-    def get_user(self, user_id: str):
-        return self.dao.get_user_by_id(user_id)
+    def get_user(self, user_id: str, fields="profile"):
+        return self.dao.get_user_by_id(user_id, fields)
 
-    def list_users(self):
-        return self.dao.list_users()
+    def list_users(self, fields="list"):
+        return self.dao.list_users(fields)
+
+    def list_users_page(self, after=None, limit: int = DEFAULT_PAGE_SIZE, fields="list"):
+        return self.dao.list_users_page(after, limit, fields)
+
+    def iter_users(self, page_size: int = DEFAULT_PAGE_SIZE, fields="list"):
+        return self.dao.iter_users(page_size, fields)
+
+    def count_users(self, count: str = "exact"):
+        return self.dao.count_users(count)
 
     def update_user(self, user_id: str, name: str = None, email: str = None):
         if email:
-            existing = self.dao.get_user_by_email(email)
+            existing = self.dao.get_user_by_email(email, "id")
             if existing and existing[0]["user_id"] != user_id:
                 return {"error": "Email already in use by another user."}
         return self.dao.update_user(user_id, name, email)
@@ -31,20 +41,44 @@ class UserService:
         return hashlib.sha256(password.encode()).hexdigest()
 
     def register_user(self, name: str, email: str, password: str):
-        existing = self.dao.get_user_by_email(email)
+        existing = self.dao.get_user_by_email(email, "id")
         if existing:
             return {"error": "Email already exists."}
-        return self.dao.create_user(name, email, self.hash_password(password))
+        # The inserted row comes back whole; the app stores it as the
+        # session user, so drop the hash as authenticate_user does.
+        return self._without_password(self.dao.create_user(name, email, self.hash_password(password)))
 
     def authenticate_user(self, email: str, password: str):
-        user = self.dao.get_user_by_email(email)
+        user = self.dao.get_user_by_email(email, "auth")
         if not user:
             return None
-        if user[0]["password"] == self.hash_password(password):
-            return user[0]
-        return None
+        user = user[0]
+        if user["password"] != self.hash_password(password):
+            return None
+        # The hash is only needed for the comparison; keep it out of the
+        # session user.
+        user["password"] = None
+        return user
 
     def update_user(self, user_id: str, name: str = None, email: str = None, password: str = None):
         hashed_pw = self.hash_password(password) if password else None
         return self.dao.update_user(user_id, name, email, hashed_pw)
 
+    def _without_password(self, rows):
+        for row in rows:
+            row["password"] = None
+        return rows
+
+
+class AsyncUserService:
+    def __init__(self, models: bool = None):
+        self.dao = AsyncUserDAO(models)
+
+    async def get_user(self, user_id: str, fields="profile"):
+        return await self.dao.get_user_by_id(user_id, fields)
+
+    async def list_users(self, fields="list"):
+        return await self.dao.list_users(fields)
+
+    async def count_users(self, count: str = "exact"):
+        return await self.dao.count_users(count)
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from services.genre_registry import split_genres
+
+
+class UserStats:
+    # Running totals for one user's watchlist, changed by +1/-1 deltas.
+
+    __slots__ = ("statuses", "ratings", "rating_sum", "rating_count", "types", "watched_by_type", "genres")
+
+    def __init__(self):
+        self.statuses = Counter()
+        self.ratings = Counter()
+        self.rating_sum = 0
+        self.rating_count = 0
+        self.types = Counter()
+        self.watched_by_type = Counter()
+        self.genres = Counter()
+
+    def apply(self, entry, sign: int):
+        status, rating, type_, genres = entry
+        self.statuses[status] += sign
+        if rating:
+            self.ratings[rating] += sign
+            self.rating_sum += sign * rating
+            self.rating_count += sign
+        if type_:
+            self.types[type_] += sign
+            if status == "watched":
+                self.watched_by_type[type_] += sign
+        for genre in genres:
+            self.genres[genre] += sign
+
+    def summary(self):
+        # Same shape as WatchlistSnapshot aggregates so the dashboard panels
+        # render either.
+        return {
+            "entries": sum(self.statuses.values()),
+            "status_counts": {status: self.statuses[status] for status in ("watched", "planning", "dropped")},
+            "rating_histogram": {rating: self.ratings[rating] for rating in range(1, 11)},
+            "average_rating": self.rating_sum / self.rating_count if self.rating_count else None,
+            "genre_counts": {genre: n for genre, n in self.genres.most_common() if n > 0},
+            "completion_by_type": {
+                type_: {"entries": n, "watched": self.watched_by_type[type_], "rate": self.watched_by_type[type_] / n}
+                for type_, n in self.types.items() if n > 0
+            },
+        }
+
+
+class UserStatsRegistry:
+    # Stats for loaded users. Each entry keeps the (status, rating, type,
+    # genres) it was counted with, so an update subtracts exactly what was
+    # added. Users reload after max_age to pick up writes from elsewhere, and
+    # past max_users the least recently read is evicted.
+
+    def __init__(self, max_age: float = 600.0, max_users: int = 1000):
+        self.max_age = max_age
+        self.max_users = max_users
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._stats = OrderedDict()
+            self._loaded_at = {}
+            self._entries = {}
+            self._by_user = {}
+            self._titles = {}
+
+    def loaded(self, user_id) -> bool:
+        loaded_at = self._loaded_at.get(user_id)
+        return loaded_at is not None and time.monotonic() - loaded_at < self.max_age
+
+    def build(self, user_id, rows):
+        # rows carry a movies_shows(type, genre) embed.
+        with self._lock:
+            self.forget(user_id)
+            stats = self._stats[user_id] = UserStats()
+            entries = self._by_user[user_id] = set()
+            for row in rows:
+                self.add_title(row["movie_id"], row.get("movies_shows") or {})
+                entry = self._entry(row)
+                stats.apply(entry, 1)
+                self._entries[row["watchlist_id"]] = (user_id, row["movie_id"], entry)
+                entries.add(row["watchlist_id"])
+            self._loaded_at[user_id] = time.monotonic()
+            while len(self._stats) > self.max_users:
+                self.forget(next(iter(self._stats)))
+            return stats
+
+    def forget(self, user_id):
+        with self._lock:
+            for watchlist_id in self._by_user.pop(user_id, ()):
+                self._entries.pop(watchlist_id, None)
+            self._stats.pop(user_id, None)
+            self._loaded_at.pop(user_id, None)
+
+    def get(self, user_id):
+        with self._lock:
+            stats = self._stats.get(user_id)
+            if stats is not None:
+                self._stats.move_to_end(user_id)
+            return stats
+
+    def add_title(self, movie_id, title):
+        self._titles[movie_id] = ((title.get("type") or "").lower(), split_genres(title.get("genre")))
+
+    def missing_titles(self, rows):
+        # Rows of loaded users whose title type and genres are not known yet.
+        return [row for row in rows if row.get("user_id") in self._stats and row["movie_id"] not in self._titles]
+
+    def add(self, row):
+        with self._lock:
+            user_id = row.get("user_id")
+            stats = self._stats.get(user_id)
+            if stats is None or row["watchlist_id"] in self._entries:
+                return
+            entry = self._entry(row)
+            stats.apply(entry, 1)
+            self._entries[row["watchlist_id"]] = (user_id, row["movie_id"], entry)
+            self._by_user[user_id].add(row["watchlist_id"])
+
+    def update(self, row):
+        with self._lock:
+            tracked = self._entries.get(row.get("watchlist_id"))
+            if tracked is None:
+                return self.add(row) if "user_id" in row and "movie_id" in row else None
+            user_id, movie_id, old = tracked
+            status, rating, type_, genres = old
+            new = (
+                (row["status"] or "").lower() if "status" in row else status,
+                row["rating"] if "rating" in row else rating,
+                type_,
+                genres,
+            )
+            stats = self._stats[user_id]
+            stats.apply(old, -1)
+            stats.apply(new, 1)
+            self._entries[row["watchlist_id"]] = (user_id, movie_id, new)
+
+    def remove(self, watchlist_id):
+        with self._lock:
+            tracked = self._entries.pop(watchlist_id, None)
+            if tracked is None:
+                return
+            user_id, _, entry = tracked
+            self._stats[user_id].apply(entry, -1)
+            self._by_user[user_id].discard(watchlist_id)
+
+    def _entry(self, row):
+        type_, genres = self._titles.get(row["movie_id"], ("", ()))
+        return ((row.get("status") or "").lower(), row.get("rating"), type_, genres)
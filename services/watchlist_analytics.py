@@ -0,0 +1,241 @@
+import threading
+import time
+
+import numpy as np
+
+from services.genre_registry import split_genres
+
+STATUSES = ("watched", "planning", "dropped")
+TYPES = ("movie", "show", "anime")
+MAX_RATING = 10
+NO_RATING = 0
+UNKNOWN = -1
+
+
+class Categories:
+    # Grow-only mapping between values and the small int codes stored in arrays.
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+class WatchlistSnapshot:
+    # Columnar copy of userwatchlist joined with movies_shows, as parallel
+    # arrays ordered by watchlist_id: new rows are appended, updates find
+    # their slot by binary search and removed rows are masked out until the
+    # next build. Titles keep one (title, genre) pair per genre.
+    # watchlist_id must be an integer serial key, since incremental
+    # refreshes only pull ids above the last one seen.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._journal = None
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.users = Categories()
+            self.titles = Categories()
+            self.statuses = Categories(STATUSES)
+            self.types = Categories(TYPES)
+            self.genres = Categories()
+            self.watchlist_id = np.empty(0, np.int64)
+            self.user = np.empty(0, np.int32)
+            self.title = np.empty(0, np.int32)
+            self.status = np.empty(0, np.int16)
+            self.rating = np.empty(0, np.int8)
+            self.live = np.empty(0, bool)
+            self.title_type = np.empty(0, np.int16)
+            self.pair_title = np.empty(0, np.int32)
+            self.pair_genre = np.empty(0, np.int32)
+            self.last_id = None
+            self.loaded_at = 0.0
+            self.built_at = 0.0
+            self.built = False
+
+    def build(self, rows):
+        # Page through the table into a fresh snapshot without the lock, so
+        # readers keep the current one until the swap. Updates and removes
+        # made meanwhile are journaled and replayed onto the new arrays.
+        with self._lock:
+            self._journal = []
+        try:
+            fresh = WatchlistSnapshot()
+            fresh.add(rows)
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+        with self._lock:
+            for method, arg in self._journal:
+                getattr(fresh, method)(arg)
+            for name, value in vars(fresh).items():
+                if name not in ("_lock", "_journal"):
+                    setattr(self, name, value)
+            self._journal = None
+            self.built_at = self.loaded_at
+            self.built = True
+
+    def add(self, rows):
+        # Appends rows with a watchlist_id above last_id, in id order. They
+        # are fetched before locking so readers are not held up by paging.
+        rows = list(rows)
+        with self._lock:
+            ids, users, titles, statuses, ratings = [], [], [], [], []
+            title_types, pair_titles, pair_genres = [], [], []
+            new_title = len(self.titles)
+            for row in rows:
+                watchlist_id = row["watchlist_id"]
+                if not isinstance(watchlist_id, (int, np.integer)):
+                    raise TypeError(f"WatchlistSnapshot needs integer watchlist_id values, got {watchlist_id!r}")
+                if self.last_id is not None and watchlist_id <= self.last_id:
+                    continue
+                ids.append(watchlist_id)
+                users.append(self.users.code(row["user_id"]))
+                title = self.titles.code(row["movie_id"])
+                titles.append(title)
+                statuses.append(self.statuses.code((row.get("status") or "").lower()))
+                ratings.append(row.get("rating") or NO_RATING)
+                if title >= new_title + len(title_types):
+                    embed = row.get("movies_shows") or {}
+                    type_ = (embed.get("type") or "").lower()
+                    title_types.append(self.types.code(type_) if type_ else UNKNOWN)
+                    for genre in split_genres(embed.get("genre")):
+                        pair_titles.append(title)
+                        pair_genres.append(self.genres.code(genre))
+            if ids:
+                if len(ids) > 1 and not (np.diff(ids) > 0).all():
+                    raise ValueError("WatchlistSnapshot rows must arrive in increasing watchlist_id order")
+                self.watchlist_id = np.concatenate([self.watchlist_id, np.array(ids, np.int64)])
+                self.user = np.concatenate([self.user, np.array(users, np.int32)])
+                self.title = np.concatenate([self.title, np.array(titles, np.int32)])
+                self.status = np.concatenate([self.status, np.array(statuses, np.int16)])
+                self.rating = np.concatenate([self.rating, np.array(ratings, np.int8)])
+                self.live = np.concatenate([self.live, np.ones(len(ids), bool)])
+                self.title_type = np.concatenate([self.title_type, np.array(title_types, np.int16)])
+                self.pair_title = np.concatenate([self.pair_title, np.array(pair_titles, np.int32)])
+                self.pair_genre = np.concatenate([self.pair_genre, np.array(pair_genres, np.int32)])
+                self.last_id = ids[-1]
+            self.loaded_at = time.monotonic()
+
+    def update(self, row):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("update", row))
+            position = self._position(row.get("watchlist_id"))
+            if position is None:
+                return
+            if "status" in row:
+                self.status[position] = self.statuses.code((row["status"] or "").lower())
+            if "rating" in row:
+                self.rating[position] = row["rating"] or NO_RATING
+
+    def remove(self, watchlist_id):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("remove", watchlist_id))
+            position = self._position(watchlist_id)
+            if position is not None:
+                self.live[position] = False
+
+    def expire(self):
+        # Inserted rows arrive without their title embed, so they are picked
+        # up by the next incremental refresh instead of being added here.
+        self.loaded_at = 0.0
+
+    def age(self):
+        return time.monotonic() - self.loaded_at
+
+    def build_age(self):
+        return time.monotonic() - self.built_at
+
+    def global_stats(self):
+        with self._lock:
+            return self._aggregate(self.live)
+
+    def user_stats(self, user_id):
+        with self._lock:
+            code = self.users.codes.get(user_id)
+            if code is None:
+                return self._aggregate(np.zeros(len(self.live), bool))
+            return self._aggregate(self.live & (self.user == code))
+
+    def entries(self, user_id=None):
+        # Live (user, title, status, rating) code arrays, optionally for one user.
+        with self._lock:
+            mask = self.live
+            if user_id is not None:
+                mask = mask & (self.user == self.users.codes.get(user_id, UNKNOWN))
+            return self.user[mask], self.title[mask], self.status[mask], self.rating[mask]
+
+    def status_by_user(self):
+        # Per-user status counts as (user_ids, counts[user, status]).
+        with self._lock:
+            shape = (len(self.users), len(self.statuses))
+            user, status = self.user[self.live], self.status[self.live]
+            counts = np.bincount(user * shape[1] + status, minlength=shape[0] * shape[1]).reshape(shape)
+            return list(self.users.values), counts
+
+    def average_rating_by_user(self):
+        with self._lock:
+            rated = self.live & (self.rating != NO_RATING)
+            sums = np.bincount(self.user[rated], weights=self.rating[rated], minlength=len(self.users))
+            counts = np.bincount(self.user[rated], minlength=len(self.users))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return list(self.users.values), np.where(counts > 0, sums / counts, np.nan)
+
+    def _position(self, watchlist_id):
+        if watchlist_id is None:
+            return None
+        position = int(np.searchsorted(self.watchlist_id, watchlist_id))
+        if position < len(self.watchlist_id) and self.watchlist_id[position] == watchlist_id:
+            return position
+        return None
+
+    def _aggregate(self, mask):
+        status = self.status[mask]
+        rating = self.rating[mask]
+        title = self.title[mask]
+
+        status_counts = np.bincount(status, minlength=len(self.statuses))
+        ratings = np.bincount(rating[rating != NO_RATING], minlength=MAX_RATING + 1)[1:MAX_RATING + 1]
+        rated = int(ratings.sum())
+
+        per_title = np.bincount(title, minlength=len(self.titles))
+        genre_counts = np.bincount(
+            self.pair_genre, weights=per_title[self.pair_title], minlength=len(self.genres)
+        ).astype(np.int64)
+
+        types = self.title_type[title]
+        known = types != UNKNOWN
+        watched = status == self.statuses.codes["watched"]
+        entries_by_type = np.bincount(types[known], minlength=len(self.types))
+        watched_by_type = np.bincount(types[known & watched], minlength=len(self.types))
+
+        order = np.argsort(-genre_counts, kind="stable")
+        return {
+            "entries": int(mask.sum()),
+            "users": int(np.unique(self.user[mask]).size),
+            "status_counts": dict(zip(self.statuses.values, status_counts.tolist())),
+            "rating_histogram": dict(zip(range(1, MAX_RATING + 1), ratings.tolist())),
+            "average_rating": float(np.dot(np.arange(1, MAX_RATING + 1), ratings) / rated) if rated else None,
+            "genre_counts": {self.genres.values[i]: int(genre_counts[i]) for i in order if genre_counts[i]},
+            "completion_by_type": {
+                type_: {"entries": int(entries), "watched": int(done), "rate": float(done / entries)}
+                for type_, entries, done in zip(self.types.values, entries_by_type, watched_by_type)
+                if entries
+            },
+        }
@@ -1,44 +1,316 @@
-from dao.watchlist_dao import WatchlistDAO
-from dao.title_dao import TitleDAO
+from dao.watchlist_dao import AsyncWatchlistDAO, WatchlistDAO
+from dao.cached_title_dao import CachedTitleDAO
 from dao.user_dao import UserDAO
+from dao.pagination import DEFAULT_PAGE_SIZE
+from dao.errors import APIError, foreign_key_violation
+from dao.models import WatchlistEntry
+from services.background import job_for
+from services.genre_registry import GenreRegistry
+from services.recommendations import ItemNeighbors, entry_weights
+from services.search_index import TitleSearchIndex
+from services.title_service import genre_registry, title_index
+from services.user_stats import UserStatsRegistry
+from services.watchlist_analytics import WatchlistSnapshot
+from services.watchlist_store import WatchlistVersions, watchlist_versions
+
+MISSING_ROW_ERRORS = {
+    "user_id": "User not found.",
+    "movie_id": "Movie/Show not found.",
+}
+
+
+# Seconds before the analytics snapshot picks up rows inserted elsewhere,
+# and before it is rebuilt to drop rows deleted or changed elsewhere.
+ANALYTICS_REFRESH = 30.0
+ANALYTICS_REBUILD = 600.0
+# Seconds between rebuilds of the title neighbour lists.
+RECOMMEND_REBUILD = 3600.0
+
+# Shared by every WatchlistService in the process, like the title indexes.
+watchlist_snapshot = WatchlistSnapshot()
+user_stats = UserStatsRegistry()
+item_neighbors = ItemNeighbors()
+
+
+def missing_row_error(error: APIError, with_value: bool = False):
+    violation = foreign_key_violation(error)
+    if violation is None or violation[0] not in MISSING_ROW_ERRORS:
+        raise error
+    column, value = violation
+    message = MISSING_ROW_ERRORS[column]
+    return {"error": f"{message[:-1]}: {value}." if with_value else message}
+
+
+def flatten_titles(rows):
+    for row in rows:
+        if isinstance(row, WatchlistEntry):
+            continue
+        title = row.pop("movies_shows", None) or {}
+        row["title"] = title.get("title")
+        row["type"] = title.get("type")
+        row["genre"] = title.get("genre")
+    return rows
+
 
 class WatchlistService:
-    def __init__(self):
-        self.dao = WatchlistDAO()
+    def __init__(self, models: bool = None, analytics: WatchlistSnapshot = None, stats: UserStatsRegistry = None, neighbors: ItemNeighbors = None, genres: GenreRegistry = None, versions: WatchlistVersions = None, titles: TitleSearchIndex = None):
+        self.dao = WatchlistDAO(models)
         self.user_dao = UserDAO()
-        self.title_dao = TitleDAO()
+        self.title_dao = CachedTitleDAO()
+        self.analytics = watchlist_snapshot if analytics is None else analytics
+        self.user_stats = user_stats if stats is None else stats
+        self.neighbors = item_neighbors if neighbors is None else neighbors
+        self.genre_registry = genre_registry if genres is None else genres
+        self.versions = watchlist_versions if versions is None else versions
+        self.title_index = title_index if titles is None else titles
+        self.analytics_dao = WatchlistDAO(models=False)
 
     def add_to_watchlist(self, user_id: str, movie_id: str, status: str = "planning", rating: int = None, review: str = None):
-        user = self.user_dao.get_user_by_id(user_id)
-        if not user:
-            return {"error": "User not found."}
-
-        movie = self.title_dao.get_title_by_id(movie_id)
-        if not movie:
-            return {"error": "Movie/Show not found."}
-
         if status.lower() not in ["watched", "planning", "dropped"]:
             return {"error": "Invalid status. Use: watched, planning, or dropped."}
 
-        return self.dao.add_to_watchlist(user_id, movie_id, status.lower(), rating, review)
+        # The userwatchlist foreign keys check that the user and title exist,
+        # so the insert is the only round trip.
+        try:
+            rows = self.dao.add_to_watchlist(user_id, movie_id, status.lower(), rating, review)
+        except APIError as e:
+            return missing_row_error(e)
+        return self._track_added(rows)
+
+    def get_user_watchlist(self, user_id: str, fields=None):
+        return self.dao.get_user_watchlist(user_id, fields)
+
+    def get_user_watchlist_page(self, user_id: str, after=None, limit: int = DEFAULT_PAGE_SIZE, fields=None):
+        return self.dao.get_user_watchlist_page(user_id, after, limit, fields)
+
+    def iter_user_watchlist(self, user_id: str, page_size: int = DEFAULT_PAGE_SIZE, fields=None):
+        return self.dao.iter_user_watchlist(user_id, page_size, fields)
 
-    def get_user_watchlist(self, user_id: str):
-        return self.dao.get_user_watchlist(user_id)
+    def get_user_watchlist_with_titles(self, user_id: str, fields="with_titles"):
+        return flatten_titles(self.dao.get_user_watchlist_with_titles(user_id, fields))
 
-    def get_user_watchlist_by_status(self, user_id: str, status: str):
+    def get_user_watchlist_with_titles_range(self, user_id: str, offset: int, limit: int, keyword: str = None, fields="with_titles"):
+        rows, total = self.dao.get_user_watchlist_with_titles_range(user_id, offset, limit, keyword, fields)
+        return flatten_titles(rows), total
+
+    def get_user_watchlist_by_status(self, user_id: str, status: str, fields=None):
         if status.lower() not in ["watched", "planning", "dropped"]:
             return {"error": "Invalid status filter."}
-        return self.dao.get_user_watchlist_by_status(user_id, status.lower())
+        return self.dao.get_user_watchlist_by_status(user_id, status.lower(), fields)
     
-    def get_user_watchlist_by_genre(self, user_id: str, genre: str):
-        return self.dao.get_user_watchlist_by_genre(user_id, genre)
+    def get_status_counts(self, user_id: str, count: str = "exact"):
+        return self.dao.status_counts(user_id, count)
+
+    def get_user_watchlist_by_genre(self, user_id: str, genres, use_index: bool = False):
+        # genres is one genre, a comma-separated list or an iterable; entries
+        # match when their title has any of them. use_index fetches the
+        # watchlist and slices it with the in-process genre index instead of
+        # filtering in the database.
+        if use_index:
+            return self.slice_by_genre(self.get_user_watchlist_with_titles(user_id), genres)
+        return flatten_titles(self.dao.get_user_watchlist_by_genre(user_id, genres))
+
+    def slice_by_genre(self, rows, genres):
+        movie_ids = self._genres().movie_ids(genres)
+        return [row for row in rows if row["movie_id"] in movie_ids]
 
 
     def update_watchlist_entry(self, watchlist_id: str, status: str = None, rating: int = None, review: str = None):
         if status and status.lower() not in ["watched", "planning", "dropped"]:
             return {"error": "Invalid status."}
-        return self.dao.update_watchlist_entry(watchlist_id, status, rating, review)
+        return self._track_updated(self.dao.update_watchlist_entry(watchlist_id, status.lower() if status else None, rating, review))
 
     def remove_from_watchlist(self, watchlist_id: str):
-        return self.dao.remove_from_watchlist(watchlist_id)
+        return self._track_removed(self.dao.remove_from_watchlist(watchlist_id))
+
+    def add_many(self, user_id: str, movie_ids, status: str = "planning", rating: int = None, review: str = None, titles=None):
+        # titles optionally maps movie_id -> a title row with type and genre,
+        # e.g. the autocomplete matches the titles were picked from.
+        if status.lower() not in ["watched", "planning", "dropped"]:
+            return {"error": "Invalid status. Use: watched, planning, or dropped."}
+
+        movie_ids = list(dict.fromkeys(movie_ids))
+        if not movie_ids:
+            return {"error": "No titles selected."}
+
+        try:
+            rows = self.dao.add_many([
+                {"user_id": user_id, "movie_id": m, "status": status.lower(), "rating": rating, "review": review}
+                for m in movie_ids
+            ])
+        except APIError as e:
+            return missing_row_error(e, with_value=True)
+        return self._track_added(rows, titles)
+
+    def update_many(self, watchlist_ids, status: str = None, rating: int = None, review: str = None):
+        if status and status.lower() not in ["watched", "planning", "dropped"]:
+            return {"error": "Invalid status."}
+        if not watchlist_ids:
+            return {"error": "No entries selected."}
+        return self._track_updated(self.dao.update_many(watchlist_ids, status.lower() if status else None, rating, review))
+
+    def upsert_many(self, entries):
+        for entry in entries:
+            status = entry.get("status")
+            if status and status.lower() not in ["watched", "planning", "dropped"]:
+                return {"error": "Invalid status."}
+        rows = self._track_updated(self.dao.upsert_many(entries))
+        self.analytics.expire()
+        return rows
+
+    def remove_many(self, watchlist_ids):
+        if not watchlist_ids:
+            return {"error": "No entries selected."}
+        return self._track_removed(self.dao.remove_many(watchlist_ids))
+
+    def get_platform_stats(self):
+        # None until the first snapshot is built.
+        snapshot = self._analytics()
+        return snapshot.global_stats() if snapshot.built else None
+
+    def get_user_stats(self, user_id: str):
+        if not self.user_stats.loaded(user_id):
+            return self.rebuild_user_stats(user_id)
+        return self.user_stats.get(user_id).summary()
+
+    def rebuild_user_stats(self, user_id: str):
+        return self.user_stats.build(user_id, self.analytics_dao.get_user_watchlist(user_id, "analytics")).summary()
+
+    def verify_user_stats(self, user_id: str):
+        # None when the user is not loaded, so there is nothing to check.
+        if not self.user_stats.loaded(user_id):
+            return None
+        fresh = UserStatsRegistry().build(user_id, self.analytics_dao.get_user_watchlist(user_id, "analytics"))
+        return fresh.summary() == self.user_stats.get(user_id).summary()
+
+    def recommend(self, user_id: str, k: int = 10):
+        # Empty until the neighbour lists have been built once.
+        snapshot = self._analytics()
+        if not self.neighbors.built or self.neighbors.age() > RECOMMEND_REBUILD:
+            # The rebuild runs in the background; older lists keep serving.
+            job_for(self.neighbors, "recommendations").start(self.rebuild_recommendations)
+        if not self.neighbors.built or not snapshot.built:
+            return []
+        _, titles, status, rating = snapshot.entries(user_id)
+        movie_ids = [snapshot.titles.values[code] for code in titles.tolist()]
+        picks = self.neighbors.recommend(movie_ids, entry_weights(snapshot.statuses.values, status, rating), k)
+        rows = {row["movie_id"]: row for row in self.title_dao.get_titles_by_ids([m for m, _ in picks], "search")}
+        return [
+            {"movie_id": m, "title": rows[m].get("title"), "type": rows[m].get("type"), "genre": rows[m].get("genre"), "score": score}
+            for m, score in picks if m in rows
+        ]
+
+    def rebuild_recommendations(self):
+        # Refresh the snapshot only through its job, joining a run already in
+        # progress, so two full builds never page through the table at once.
+        job = job_for(self.analytics, "watchlist-analytics")
+        job.start(self.refresh_analytics)
+        job.wait()
+        if job.error is not None:
+            raise job.error
+        self.neighbors.build(self.analytics)
+
+    def rebuild_analytics(self):
+        self.analytics.build(self.analytics_dao.iter_watchlist(fields="analytics"))
+
+    def refresh_analytics(self):
+        # Rebuild when missing or old, else pull rows added since the last refresh.
+        if not self.analytics.built or self.analytics.build_age() > ANALYTICS_REBUILD:
+            self.rebuild_analytics()
+        elif self.analytics.age() > ANALYTICS_REFRESH:
+            self.analytics.add(self.analytics_dao.iter_watchlist(fields="analytics", after=self.analytics.last_id))
+
+    def _analytics(self):
+        # Reads never page through the table themselves: a stale snapshot is
+        # refreshed on a background thread and the last built one is served
+        # meanwhile.
+        snapshot = self.analytics
+        if not snapshot.built or snapshot.build_age() > ANALYTICS_REBUILD or snapshot.age() > ANALYTICS_REFRESH:
+            job_for(snapshot, "watchlist-analytics").start(self.refresh_analytics)
+        return snapshot
+
+    def _genres(self):
+        if not self.genre_registry.built:
+            self.genre_registry.build(self.title_dao.iter_titles(fields="genre"))
+        return self.genre_registry
+
+    def _track_added(self, rows, titles=None):
+        self.versions.bump(rows)
+        self.analytics.expire()
+        self._load_titles(rows, titles)
+        for row in rows:
+            self.user_stats.add(row)
+        return rows
+
+    def _track_updated(self, rows):
+        if not isinstance(rows, list):
+            return rows
+        self.versions.bump(rows)
+        self._load_titles(rows)
+        for row in rows:
+            self.user_stats.update(row)
+            if self.analytics.built:
+                self.analytics.update(row)
+        return rows
+
+    def _track_removed(self, rows):
+        if not isinstance(rows, list):
+            return rows
+        self.versions.bump(rows)
+        for row in rows:
+            self.user_stats.remove(row["watchlist_id"])
+            if self.analytics.built:
+                self.analytics.remove(row["watchlist_id"])
+        return rows
+
+    def _load_titles(self, rows, titles=None):
+        # Inserted rows carry no title embed. Type and genres come from the
+        # caller's title rows or the title search index when either has them;
+        # the rest are fetched in one query, and only for users whose stats
+        # are loaded.
+        titles = titles or {}
+        missing = set()
+        for row in self.user_stats.missing_titles(rows):
+            movie_id = row["movie_id"]
+            title = titles.get(movie_id) or self.title_index.get(movie_id)
+            if title is not None and "type" in title:
+                self.user_stats.add_title(movie_id, title)
+            else:
+                missing.add(movie_id)
+        if missing:
+            for title in self.title_dao.get_titles_by_ids(missing, "search"):
+                self.user_stats.add_title(title["movie_id"], title)
+
+
+class AsyncWatchlistService:
+    def __init__(self, models: bool = None):
+        self.dao = AsyncWatchlistDAO(models)
+
+    async def add_to_watchlist(self, user_id: str, movie_id: str, status: str = "planning", rating: int = None, review: str = None):
+        if status.lower() not in ["watched", "planning", "dropped"]:
+            return {"error": "Invalid status. Use: watched, planning, or dropped."}
+        try:
+            return await self.dao.add_to_watchlist(user_id, movie_id, status.lower(), rating, review)
+        except APIError as e:
+            return missing_row_error(e)
+
+    async def get_user_watchlist(self, user_id: str, fields=None):
+        return await self.dao.get_user_watchlist(user_id, fields)
+
+    async def get_user_watchlist_with_titles(self, user_id: str, fields="with_titles"):
+        return flatten_titles(await self.dao.get_user_watchlist_with_titles(user_id, fields))
+
+    async def get_user_watchlist_with_titles_range(self, user_id: str, offset: int, limit: int, keyword: str = None, fields="with_titles"):
+        rows, total = await self.dao.get_user_watchlist_with_titles_range(user_id, offset, limit, keyword, fields)
+        return flatten_titles(rows), total
+
+    async def get_status_counts(self, user_id: str, count: str = "exact"):
+        return await self.dao.status_counts(user_id, count)
+
+    async def update_watchlist_entry(self, watchlist_id: str, status: str = None, rating: int = None, review: str = None):
+        if status and status.lower() not in ["watched", "planning", "dropped"]:
+            return {"error": "Invalid status."}
+        return await self.dao.update_watchlist_entry(watchlist_id, status, rating, review)
 
+    async def remove_from_watchlist(self, watchlist_id: str):
+        return await self.dao.remove_from_watchlist(watchlist_id)
@@ -0,0 +1,157 @@
+import re
+import threading
+import time
+
+from dao.projections import columns
+
+# Seconds before a session reloads its watchlist to pick up writes made by
+# other processes.
+STORE_MAX_AGE = 120.0
+# Watchlists up to this size are held whole; larger ones are paged by the
+# database on every read, as before the store existed.
+STORE_MAX_ROWS = 2000
+
+
+class WatchlistVersions:
+    # Per-user write counters, bumped by every watchlist write in the
+    # process. bump_all moves every user at once, for writes that do not name
+    # their users, like a title delete cascading to its entries.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._epoch = 0
+
+    def get(self, user_id) -> int:
+        return self._epoch + self._versions.get(user_id, 0)
+
+    def bump(self, rows):
+        with self._lock:
+            for user_id in {row.get("user_id") for row in rows} - {None}:
+                self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def bump_all(self):
+        with self._lock:
+            self._epoch += 1
+
+
+# Shared by every WatchlistService and TitleService in the process.
+watchlist_versions = WatchlistVersions()
+
+
+class WatchlistStore:
+    # One session's watchlist, loaded once and patched with the rows its own
+    # writes return. A write from another session moves the user's version
+    # past the store's, and max_age bounds how long other processes' writes
+    # stay invisible; either makes the next read reload.
+    # A watchlist longer than max_rows stays partial: page() reads each page
+    # from the database, and the store loads again only once an unfiltered
+    # page reports that the list fits.
+
+    def __init__(self, service, user_id: str, fields="page", max_age: float = STORE_MAX_AGE, max_rows: int = STORE_MAX_ROWS):
+        self.service = service
+        self.user_id = user_id
+        self.fields = fields
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self._rows = {}
+        self.partial = False
+        self.version = None
+        self.loaded_at = 0.0
+
+    def stale(self) -> bool:
+        return (
+            self.version != self.service.versions.get(self.user_id)
+            or time.monotonic() - self.loaded_at >= self.max_age
+        )
+
+    def load(self):
+        # Read the version first so a write racing the fetch forces a reload.
+        version = self.service.versions.get(self.user_id)
+        rows, total = self.service.get_user_watchlist_with_titles_range(self.user_id, 0, self.max_rows, None, self.fields)
+        self.partial = total > len(rows)
+        self._rows = {} if self.partial else {row["watchlist_id"]: row for row in rows}
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def expire(self):
+        self.version = None
+
+    def rows(self):
+        if self.stale() and not self.partial:
+            self.load()
+        return list(self._rows.values())
+
+    def page(self, offset: int, limit: int, keyword: str = None):
+        # Same (rows, total) contract as get_user_watchlist_with_titles_range.
+        rows = self.rows()
+        if self.partial:
+            rows, total = self.service.get_user_watchlist_with_titles_range(self.user_id, offset, limit, keyword, self.fields)
+            if not keyword and total <= self.max_rows:
+                self.partial = False
+                self.expire()
+            return rows, total
+        if keyword:
+            keyword = keyword.lower()
+            rows = [row for row in rows if keyword in (row.get("title") or "").lower()]
+        return rows[offset:offset + limit], len(rows)
+
+    def add_many(self, movie_ids, status: str = "planning", rating: int = None, review: str = None, titles=None):
+        # titles maps movie_id -> its title row (title, type, genre) for the
+        # new rows, which come back from the insert without the embed.
+        titles = titles or {}
+        return self._write(
+            lambda: self.service.add_many(self.user_id, movie_ids, status, rating, review, titles),
+            lambda rows: self._added(rows, titles),
+        )
+
+    def update_many(self, watchlist_ids, status: str = None, rating: int = None, review: str = None):
+        return self._write(lambda: self.service.update_many(watchlist_ids, status, rating, review), self._updated)
+
+    def remove_many(self, watchlist_ids):
+        return self._write(lambda: self.service.remove_many(watchlist_ids), self._removed)
+
+    def _write(self, write, apply):
+        expected = self.service.versions.get(self.user_id)
+        result = write()
+        if not isinstance(result, list):
+            return result
+        if not self.partial:
+            apply(result)
+        # In sync only if this write was the one change since the last sync.
+        changed = any(row.get("user_id") == self.user_id for row in result)
+        if self.version == expected and self.service.versions.get(self.user_id) == expected + changed:
+            self.version = expected + changed
+        return result
+
+    def _added(self, rows, titles):
+        for row in rows:
+            if row.get("user_id") != self.user_id:
+                continue
+            title = titles.get(row["movie_id"])
+            if title is None:
+                self.expire()
+            entry = self._entry(row, title or {})
+            self._rows[entry["watchlist_id"]] = entry
+
+    def _entry(self, row, title):
+        # Shape an inserted row like a loaded one: the projection's own
+        # columns plus the flattened title fields.
+        names = [name.strip() for name in re.sub(r"\w+\([^)]*\)", "", columns("userwatchlist", self.fields)).split(",")]
+        names = [name for name in names if name]
+        entry = dict(row) if "*" in names else {name: row.get(name) for name in names}
+        entry.update(title=title.get("title"), type=title.get("type"), genre=title.get("genre"))
+        return entry
+
+    def _updated(self, rows):
+        for row in rows:
+            entry = self._rows.get(row.get("watchlist_id"))
+            if entry is None:
+                continue
+            for key in ("status", "rating", "review"):
+                if key in row and key in entry:
+                    entry[key] = row[key]
+
+    def _removed(self, rows):
+        for row in rows:
+            self._rows.pop(row.get("watchlist_id"), None)